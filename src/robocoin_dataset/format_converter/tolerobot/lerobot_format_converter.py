@@ -1,5 +1,6 @@
 import importlib
 import logging
+import os
 from abc import abstractmethod
 from collections.abc import Iterable
 from pathlib import Path
@@ -301,19 +302,25 @@ class LerobotFormatConverter:
         task_paths_dict = {}
         try:
             while len(dirs_to_scan) > 0:
-                current_path = dirs_to_scan.pop(0)
-                files = Path(current_path).glob(LOCAL_TASK_INFO_FILE_NAME)
+                current_path = Path(dirs_to_scan.pop(0))
+                # One scandir pass per directory finds both the task info file and the
+                # sub directories; DirEntry carries the file type, so no extra stat() calls.
                 has_task_file = False
-                for file in files:
-                    with file.open("r") as f:
+                sub_dirs = []
+                with os.scandir(current_path) as entries:
+                    for entry in entries:
+                        if entry.name == LOCAL_TASK_INFO_FILE_NAME:
+                            has_task_file = True
+                        elif entry.is_dir():
+                            sub_dirs.append(current_path / entry.name)
+
+                if has_task_file:
+                    with (current_path / LOCAL_TASK_INFO_FILE_NAME).open("r") as f:
                         task_info_dict = yaml.safe_load(f)
                         task_index = task_info_dict[TASK_INDEX_KEY]
                         task = self.tasks[task_index]
-                        task_paths_dict[file.parent] = task
-                        has_task_file = True
-
-                if not has_task_file:
-                    sub_dirs = [item for item in Path(current_path).glob("*") if item.is_dir()]
+                        task_paths_dict[current_path] = task
+                else:
                     dirs_to_scan.extend(sub_dirs)
 
         except Exception as e:
@@ -420,7 +427,7 @@ class LerobotFormatConverter:
                     if spatial_covertor_funcs[state_config[CONVERT_FUNC_KEY]]:
                         sub_states_data = spatial_covertor_funcs[state_config[CONVERT_FUNC_KEY]](
                             sub_states_data
-                        ).astype(np.float32)
+                        ).astype(np.float32, copy=False)
 
             sub_states_datas.append(sub_states_data)
 
@@ -447,7 +454,7 @@ class LerobotFormatConverter:
                     if spatial_covertor_funcs[action_config[CONVERT_FUNC_KEY]]:
                         sub_actions_data = spatial_covertor_funcs[action_config[CONVERT_FUNC_KEY]](
                             sub_actions_data
-                        ).astype(np.float32)
+                        ).astype(np.float32, copy=False)
             sub_actions_datas.append(sub_actions_data)
 
         return {lerobot_feature: np.concatenate(sub_actions_datas)}
@@ -580,6 +587,8 @@ class LerobotFormatConverter:
                 images_buffer, states_buffer, actions_buffer = self._prepare_episode_buffers(
                     task_path, task_ep_idx
                 )
+                # The task does not change within an episode, so look it up once
+                episode_task = self._get_episode_task(task_ep_idx)
                 for frame_data in self._gen_episode_frames(
                     task_path, task_ep_idx, images_buffer, states_buffer, actions_buffer
                 ):
@@ -591,7 +600,7 @@ class LerobotFormatConverter:
                         states_buffer=states_buffer,
                         actions_buffer=actions_buffer,
                     )
-                    dataset.add_frame(frame=lerobot_datas, task=self._get_episode_task(task_ep_idx))
+                    dataset.add_frame(frame=lerobot_datas, task=episode_task)
 
                 dataset.save_episode()
                 yield (task, task_ep_idx, ep_idx)
@@ -1,32 +1,155 @@
 import io
 import json
 import logging
+import os
 import re
-from dataclasses import dataclass
-from functools import cached_property
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 import numpy as np
 from natsort import natsorted
-from PIL import Image
 
 from robocoin_dataset.format_converter.tolerobot.constant import (
+    ACTION_KEY,
     ARGS_KEY,
     FEATURES_KEY,
+    IMAGE_KEY,
     OBSERVATION_KEY,
     STATE_KEY,
+    SUB_ACTION_KEY,
     SUB_STATE_KEY,
 )
 from robocoin_dataset.format_converter.tolerobot.lerobot_format_converter import (
     LerobotFormatConverter,
 )
+from robocoin_dataset.format_converter.utils.frame_prefetcher import FramePrefetcher
+from robocoin_dataset.format_converter.utils.image_decoder import (
+    HAS_FADVISE,
+    JPEG_SUFFIXES,
+    decode_image_file,
+    readahead_files,
+)
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _fast_json_load(path: Path) -> any:
+    """读取JSON文件，优先使用orjson，未安装时回退到标准库json"""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def _iter_images(root: Path) -> Iterator[Path]:
+    """一次遍历目录树，按扩展名（不区分大小写）找出所有JPG/JPEG文件"""
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            if os.path.splitext(file_name)[1].lower() in JPEG_SUFFIXES:
+                yield Path(dir_path) / file_name
+
+
+def _find_images(root: Path) -> list[Path]:
+    return list(_iter_images(root))
+
+
+# G1图像文件名：{帧号}_{类型}_{相机索引}，例如000379_color_0 -> (帧号379, 相机0)
+_FRAME_NAME_RE = re.compile(r"^(\d+)_[^_]+_(\d)$")
+# image_key末尾的数字为相机索引，例如color_1 -> 1
+_CAMERA_KEY_PATTERN = re.compile(r"(\d+)$")
+
+
+def _parse_image_name(stem: str) -> tuple[int | None, int | None]:
+    """
+    一次解析出(相机索引, 帧号)
+    不符合标准命名时回退：相机索引取文件名最后一位数字，帧号取第一个"_"之前的整数
+    """
+    match = _FRAME_NAME_RE.match(stem)
+    if match:
+        return int(match.group(2)), int(match.group(1))
+
+    camera_idx = int(stem[-1]) if stem and stem[-1] in "0123456789" else None
+    try:
+        frame_idx = int(stem.split("_")[0])
+    except ValueError:
+        frame_idx = None
+    return camera_idx, frame_idx
+
+
+def _group_image_entries_by_camera(
+    jpg_files: list[Path],
+) -> dict[int, list[tuple[int | None, Path]]]:
+    """按相机分组，每个相机得到按文件名自然排序的(帧号, 路径)列表"""
+    camera_groups: dict[int, list[tuple[int | None, Path]]] = {}
+    for jpg_file in jpg_files:
+        camera_idx, frame_idx = _parse_image_name(jpg_file.stem)
+        if camera_idx is not None:
+            camera_groups.setdefault(camera_idx, []).append((frame_idx, jpg_file))
+
+    # 对每个相机的图像排序：帧号均已解析时直接按整数帧号排序（同帧号再按文件名，保证结果确定），
+    # 否则回退到按文件名自然排序
+    for camera_idx, entries in camera_groups.items():
+        if all(frame_idx is not None for frame_idx, _ in entries):
+            entries.sort(key=lambda entry: (entry[0], entry[1].name))
+        else:
+            camera_groups[camera_idx] = natsorted(entries, key=lambda entry: entry[1].name)
 
+    # 按相机索引排序
+    return dict(sorted(camera_groups.items()))
 
-@dataclass
-class G1Buffer:
-    g1_data: dict | None = None
-    task_path: Path | None = None
-    ep_idx: int | None = None
+
+def _group_images_by_camera(jpg_files: list[Path]) -> dict[int, list[Path]]:
+    return {
+        camera_idx: [path for _, path in entries]
+        for camera_idx, entries in _group_image_entries_by_camera(jpg_files).items()
+    }
+
+
+@lru_cache(maxsize=128)
+def _scan_camera_groups(
+    json_dir: Path,
+) -> tuple[tuple[Path, ...], dict[int, tuple[tuple[int | None, Path], ...]]]:
+    """
+    扫描episode目录下的图像并按相机分组，文件名只解析一次
+    结果按目录缓存：初始化时的样本帧读取与后续转换共用同一次扫描，转换过程中episode目录不会变化
+    """
+    jpg_files = _find_images(json_dir)
+    camera_groups = _group_image_entries_by_camera(jpg_files)
+    return tuple(jpg_files), {
+        cam_idx: tuple(entries) for cam_idx, entries in camera_groups.items()
+    }
+
+
+def _scandir_entries(directory: str) -> list[os.DirEntry]:
+    """列出目录项；无权限或目录不可访问时返回空列表"""
+    try:
+        with os.scandir(directory) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def _list_json_files(directory: str) -> list[Path]:
+    """递归收集目录下的所有JSON文件（迭代式os.scandir，单次遍历）"""
+    json_files = []
+    dirs_to_scan = [directory]
+    while dirs_to_scan:
+        for entry in _scandir_entries(dirs_to_scan.pop()):
+            if entry.name.endswith(".json") and entry.is_file():
+                json_files.append(Path(entry.path))
+            elif entry.is_dir():
+                dirs_to_scan.append(entry.path)
+    return json_files
 
 
 class LerobotFormatConverterG1(LerobotFormatConverter):
@@ -41,8 +164,28 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         video_backend: str = "pyav",
         image_writer_processes: int = 4,
         image_writer_threads: int = 4,
+        episode_cache_size: int = 4,
+        image_prefetch_window: int = 8,
+        use_readahead: bool = True,
     ) -> None:
-        self.g1_buffer: G1Buffer = G1Buffer()
+        # 按(task_path, ep_idx)缓存最近加载的episode JSON，LRU淘汰
+        self._episode_cache: OrderedDict[tuple[Path, int], dict] = OrderedDict()
+        self._episode_cache_size = max(1, episode_cache_size)
+        # 后台线程预读下一个episode的JSON，与当前episode的帧处理重叠
+        self._prefetch_thread: threading.Thread | None = None
+        self._prefetch_key: tuple[Path, int] | None = None
+        self._prefetched: dict[tuple[Path, int], dict] = {}
+        self._prefetch_lock = threading.Lock()
+        # json_path -> 预先拆分好的路径元组，避免每帧重复split
+        self._path_parts_cache: dict[str, tuple[str, ...]] = {}
+        # 图像预读线程池：每个相机提前解码接下来image_prefetch_window帧，0表示关闭预读
+        self._image_prefetch_window = max(0, image_prefetch_window)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, image_writer_threads))
+        # 准备episode缓存时让内核批量预读该episode的全部图像（仅Linux等支持posix_fadvise的平台）
+        self._use_readahead = use_readahead and HAS_FADVISE
+        # 配置中实际用到的json_path与image_key，在配置校验通过后计算；None表示尚未确定（全部使用）
+        self._required_json_paths: frozenset[str] | None = None
+        self._required_image_keys: frozenset[str] | None = None
         
         # G1多相机自动检测
         if self._has_auto_camera_detection(converter_config):
@@ -61,6 +204,34 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
             image_writer_threads=image_writer_threads,
         )
 
+        # 配置在转换器生命周期内不变，只需遍历一次
+        self._required_json_paths, self._required_image_keys = self._collect_config_keys()
+        for json_path in self._required_json_paths:
+            self._get_path_parts(json_path)
+
+    def _debug_enabled(self) -> bool:
+        """调试日志开关；关闭时热路径上只有一次级别比较，不做任何字符串格式化"""
+        logger = getattr(self, "logger", None)
+        return logger is not None and logger.isEnabledFor(logging.DEBUG)
+
+    def _collect_config_keys(self) -> tuple[frozenset[str], frozenset[str]]:
+        """从converter_config中收集状态/动作用到的json_path，以及图像用到的image_key"""
+        features = self.converter_config[FEATURES_KEY]
+        sub_configs = [
+            *features[OBSERVATION_KEY][STATE_KEY][SUB_STATE_KEY],
+            *features[ACTION_KEY][SUB_ACTION_KEY],
+        ]
+        required_json_paths = frozenset(
+            sub_config[ARGS_KEY]["json_path"]
+            for sub_config in sub_configs
+            if "json_path" in sub_config.get(ARGS_KEY, {})
+        )
+        required_image_keys = frozenset(
+            image_config.get(ARGS_KEY, {}).get("image_key", "color_0")
+            for image_config in features[OBSERVATION_KEY].get(IMAGE_KEY, [])
+        )
+        return required_json_paths, required_image_keys
+
     # @override
     def _get_frame_image(
         self,
@@ -70,13 +241,14 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         args_dict: dict,
         images_buffer: any = None,
     ) -> np.ndarray:
+        # 临时构建的缓存（如初始化时读取样本帧）没有预读器，直接同步解码
         if not images_buffer:
             images_buffer = self._prepare_episode_images_buffer(task_path, ep_idx)
 
         # 从缓存的图像列表中获取指定帧的图像
         image_key = args_dict.get("image_key", "color_0")  # 默认为color_0
-        print("g1_override _get_frame_image")
-        print(f"image_key: {image_key}, frame_idx: {frame_idx}")
+        if self._debug_enabled():
+            self.logger.debug(f"G1 _get_frame_image image_key: {image_key}, frame_idx: {frame_idx}")
         
         # G1多相机支持：从image_key解析相机索引
         camera_idx = self._extract_camera_index_from_key(image_key)
@@ -87,50 +259,40 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         if camera_idx not in camera_groups:
             raise ValueError(f"Camera {camera_idx} not found. Available cameras: {list(camera_groups.keys())}")
         
-        camera_files = camera_groups[camera_idx]
-        
-        # 查找与frame_idx匹配的图像文件，支持稀疏采样
-        target_image_path = None
-        for image_path in camera_files:
-            # 从文件名提取帧号，例如：000379_color_0.jpg -> 379
-            filename = image_path.stem  # 去掉扩展名
-            frame_num_str = filename.split('_')[0]  # 取第一部分
-            try:
-                file_frame_idx = int(frame_num_str)
-                if file_frame_idx == frame_idx:
-                    target_image_path = image_path
-                    break
-            except ValueError:
-                continue
-        
+        # 帧号→文件映射在准备episode缓存时已构建，精确匹配O(1)，支持稀疏采样
+        frame_index_map = images_buffer["frame_index_maps"][camera_idx]
+        target_image_path = frame_index_map.get(frame_idx)
+
         if target_image_path is None:
-            # 如果找不到精确匹配的帧，使用最近的帧或最后一帧
-            if camera_files:
-                # 找到最接近的帧
-                closest_file = None
-                min_distance = float('inf')
-                for image_path in camera_files:
-                    filename = image_path.stem
-                    frame_num_str = filename.split('_')[0]
-                    try:
-                        file_frame_idx = int(frame_num_str)
-                        distance = abs(file_frame_idx - frame_idx)
-                        if distance < min_distance:
-                            min_distance = distance
-                            closest_file = image_path
-                    except ValueError:
-                        continue
-                target_image_path = closest_file
-            
-            if target_image_path is None:
+            # 如果找不到精确匹配的帧，使用最近的帧
+            frame_indices = images_buffer["frame_index_arrays"][camera_idx]
+            if len(frame_indices) == 0:
                 raise ValueError(f"No suitable image found for frame {frame_idx} in camera {camera_idx}")
-        
-        if not target_image_path.exists():
-            raise ValueError(f"Image file not found: {target_image_path}")
-        
-        # 读取并返回图像
-        img = Image.open(target_image_path)
-        return np.array(img)
+            pos = int(np.searchsorted(frame_indices, frame_idx))
+            if pos == 0:
+                closest_frame_idx = frame_indices[0]
+            elif pos == len(frame_indices):
+                closest_frame_idx = frame_indices[-1]
+            else:
+                before, after = frame_indices[pos - 1], frame_indices[pos]
+                closest_frame_idx = before if frame_idx - before <= after - frame_idx else after
+            target_image_path = frame_index_map[int(closest_frame_idx)]
+
+        prefetcher = images_buffer["prefetchers"].get(camera_idx)
+
+        # 文件列表来自准备缓存时的目录扫描，无需再stat一次；文件被删除等情况由打开失败兜底，
+        # 解码失败（损坏或截断的图像）按原异常抛出
+        try:
+            if prefetcher is None:
+                return decode_image_file(target_image_path)
+            frame_indices = images_buffer["frame_index_arrays"][camera_idx]
+            pos = int(np.searchsorted(frame_indices, frame_idx, side="right"))
+            upcoming_paths = (
+                frame_index_map[int(i)] for i in frame_indices[pos : pos + prefetcher.window]
+            )
+            return prefetcher.get(target_image_path, upcoming_paths)
+        except FileNotFoundError as e:
+            raise ValueError(f"Image file not found: {target_image_path}") from e
 
     # @override
     def _get_frame_sub_states(
@@ -149,22 +311,9 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         from_idx = args_dict["range_from"]
         to_idx = args_dict["range_to"]
         
-        # 获取帧数据
-        frame_data = sub_states_buffer["data"][frame_idx]
-        
-        # 按路径导航到目标数据
-        data = frame_data
-        for path_part in json_path.split('.'):
-            if path_part in data:
-                data = data[path_part]
-            else:
-                raise ValueError(f"Path '{json_path}' not found in frame {frame_idx}")
-        
-        # 提取指定范围的数据
-        if isinstance(data, list):
-            return np.array(data[from_idx:to_idx], dtype=np.float32)
-        else:
-            raise ValueError(f"Expected list data for path '{json_path}', got {type(data)}")
+        return self._get_frame_json_slice(
+            sub_states_buffer, json_path, frame_idx, from_idx, to_idx
+        )
 
     # @override
     def _get_frame_sub_actions(
@@ -183,32 +332,76 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         from_idx = args_dict["range_from"]
         to_idx = args_dict["range_to"]
         
-        # 获取帧数据
-        frame_data = sub_actions_buffer["data"][frame_idx]
-        
-        # 按路径导航到目标数据
-        data = frame_data
-        for path_part in json_path.split('.'):
-            if path_part in data:
-                data = data[path_part]
-            else:
-                raise ValueError(f"Path '{json_path}' not found in frame {frame_idx}")
-        
-        # 提取指定范围的数据
+        return self._get_frame_json_slice(
+            sub_actions_buffer, json_path, frame_idx, from_idx, to_idx
+        )
+
+    def _get_frame_json_slice(
+        self,
+        episode_buffer: dict,
+        json_path: str,
+        frame_idx: int,
+        from_idx: int,
+        to_idx: int,
+    ) -> np.ndarray:
+        """
+        从episode缓存中取出指定帧、指定路径的数据切片
+        首次访问某个json_path时，将所有帧的数据一次性转换为[N, D]的float32数组，
+        之后每帧只需返回该数组的一个切片视图
+        """
+        arrays = episode_buffer["arrays"]
+        if json_path not in arrays:
+            arrays[json_path] = self._build_json_path_array(episode_buffer["data"], json_path)
+
+        array = arrays[json_path]
+        if array is not None:
+            return array[frame_idx, from_idx:to_idx]
+
+        # 各帧数据长度不一致时，回退到逐帧转换
+        data = self._get_json_path_value(episode_buffer["data"][frame_idx], json_path, frame_idx)
         if isinstance(data, list):
             return np.array(data[from_idx:to_idx], dtype=np.float32)
-        else:
-            raise ValueError(f"Expected list data for path '{json_path}', got {type(data)}")
+        raise ValueError(f"Expected list data for path '{json_path}', got {type(data)}")
+
+    def _build_json_path_array(self, frames: list[dict], json_path: str) -> np.ndarray | None:
+        values = []
+        for frame_idx, frame_data in enumerate(frames):
+            data = self._get_json_path_value(frame_data, json_path, frame_idx)
+            if not isinstance(data, list):
+                return None
+            values.append(data)
+        try:
+            array = np.asarray(values, dtype=np.float32)
+        except ValueError:
+            return None
+        return array if array.ndim == 2 else None
+
+    def _get_json_path_value(self, frame_data: dict, json_path: str, frame_idx: int) -> any:
+        # 按路径导航到目标数据，例如: "states.left_arm.qpos"
+        data = frame_data
+        try:
+            for path_part in self._get_path_parts(json_path):
+                data = data[path_part]
+        except (KeyError, TypeError):
+            raise ValueError(f"Path '{json_path}' not found in frame {frame_idx}")
+        return data
+
+    def _get_path_parts(self, json_path: str) -> tuple[str, ...]:
+        path_parts = self._path_parts_cache.get(json_path)
+        if path_parts is None:
+            path_parts = tuple(json_path.split("."))
+            self._path_parts_cache[json_path] = path_parts
+        return path_parts
 
     # @override
     def _get_episode_frames_num(self, task_path: Path, ep_idx: int) -> int:
-        json_file_path = self.task_episode_jsonfile_paths[task_path][ep_idx]
+        # 经由episode缓存加载，随后准备帧数据时直接命中缓存，JSON只解析一次
+        json_data = self._get_episode_json_data(task_path, ep_idx)
         try:
-            with open(json_file_path, "r") as json_file:
-                json_data = json.load(json_file)
-                return len(json_data["data"])
-        except Exception as e:
-            raise ValueError(f"Error while reading json file {json_file_path}: {e}")
+            return len(json_data["data"])
+        except (KeyError, TypeError) as e:
+            json_file_path = self.task_episode_jsonfile_paths[task_path][ep_idx]
+            raise ValueError(f"Error while reading json file {json_file_path}: {e}") from e
 
     # @override
     def _get_task_episodes_num(self, task_path: Path) -> int:
@@ -226,68 +419,141 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         json_file_path = self.task_episode_jsonfile_paths[task_path][ep_idx]
         json_dir = json_file_path.parent
         
-        # 从JSON同级目录递归搜索JPG文件
-        jpg_files = list(json_dir.rglob("*.jpg"))
-        jpg_files.extend(list(json_dir.rglob("*.JPG")))  # 支持大写扩展名
-        jpg_files.extend(list(json_dir.rglob("*.jpeg")))  # 支持jpeg格式
-        jpg_files.extend(list(json_dir.rglob("*.JPEG")))
-        
-        # G1多相机自动分组：按文件名模式分组
-        camera_groups = self._group_images_by_camera_g1(jpg_files)
-        
-        print(f"Found {len(jpg_files)} image files in {json_dir}")
-        print(f"Detected {len(camera_groups)} cameras")
-        
-        for cam_idx, cam_files in camera_groups.items():
-            print(f"  Camera {cam_idx}: {len(cam_files)} images")
-            if cam_files:
-                print(f"    First: {cam_files[0].name}")
-                print(f"    Last: {cam_files[-1].name}")
+        # 从JSON同级目录递归搜索JPG文件，并按文件名模式进行G1多相机自动分组
+        cached_jpg_files, cached_camera_entries = _scan_camera_groups(json_dir)
+        jpg_files = list(cached_jpg_files)
+        camera_groups = {
+            cam_idx: [path for _, path in entries]
+            for cam_idx, entries in cached_camera_entries.items()
+        }
         
+        if self._debug_enabled():
+            self.logger.debug(f"Found {len(jpg_files)} image files in {json_dir}")
+            self.logger.debug(f"Detected {len(camera_groups)} cameras")
+            for cam_idx, cam_files in camera_groups.items():
+                self.logger.debug(f"  Camera {cam_idx}: {len(cam_files)} images")
+                if cam_files:
+                    self.logger.debug(f"    First: {cam_files[0].name}")
+                    self.logger.debug(f"    Last: {cam_files[-1].name}")
+        
+        # 帧号在扫描分组时已随相机索引一并解析，例如：000379_color_0.jpg -> 379
+        frame_index_maps: dict[int, dict[int, Path]] = {}
+        frame_index_arrays: dict[int, np.ndarray] = {}
+        for cam_idx, entries in cached_camera_entries.items():
+            frame_index_map: dict[int, Path] = {}
+            for file_frame_idx, image_path in entries:
+                if file_frame_idx is not None:
+                    frame_index_map.setdefault(file_frame_idx, image_path)
+            frame_index_maps[cam_idx] = frame_index_map
+            frame_index_arrays[cam_idx] = np.array(sorted(frame_index_map), dtype=np.int64)
+
         return {
             "camera_groups": camera_groups,
+            "frame_index_maps": frame_index_maps,
+            "frame_index_arrays": frame_index_arrays,
+            # 相机索引 -> FramePrefetcher，仅转换时由_start_image_prefetch填充
+            "prefetchers": {},
             "all_image_files": jpg_files,
             "json_data": self._get_episode_json_data(task_path, ep_idx)
         }
 
+    # @override
+    def _prepare_episode_buffers(self, task_path: Path, ep_idx: int) -> tuple[any, any, any]:
+        images_buffer, states_buffer, actions_buffer = super()._prepare_episode_buffers(
+            task_path, ep_idx
+        )
+        self._start_image_prefetch(images_buffer)
+        return images_buffer, states_buffer, actions_buffer
+
+    def _start_image_prefetch(self, images_buffer: dict) -> None:
+        """
+        为转换中逐帧读取的episode图像缓存提交内核预读并创建各相机的预读器
+        只在convert()准备episode缓存时调用；临时构建的缓存（如初始化时读取样本帧）不预读，
+        避免为不会被转换的整个episode排队预读任务
+        """
+        camera_groups = images_buffer["camera_groups"]
+        if self._use_readahead:
+            # 只预读配置中用到的相机；在后台提交，不阻塞当前episode的准备
+            readahead_paths = images_buffer["all_image_files"]
+            if self._required_image_keys is not None:
+                required_cameras = {
+                    self._extract_camera_index_from_key(image_key)
+                    for image_key in self._required_image_keys
+                }
+                readahead_paths = [
+                    path
+                    for cam_idx, cam_files in camera_groups.items()
+                    if cam_idx in required_cameras
+                    for path in cam_files
+                ]
+            self._image_pool.submit(readahead_files, readahead_paths)
+
+        if self._image_prefetch_window:
+            images_buffer["prefetchers"] = {
+                cam_idx: FramePrefetcher(
+                    self._image_pool, decode_image_file, self._image_prefetch_window
+                )
+                for cam_idx in camera_groups
+            }
+
     # @override
     def _prepare_episode_states_buffer(self, task_path: Path, ep_idx: int) -> any:
-        return self._get_episode_json_data(task_path, ep_idx)
+        json_data = self._get_episode_json_data(task_path, ep_idx)
+        # arrays: json_path -> [N, D] float32数组，首次访问时按需构建
+        return {"data": json_data["data"], "arrays": {}}
 
     # @override
     def _prepare_episode_actions_buffer(self, task_path: Path, ep_idx: int) -> any:
-        return self._get_episode_json_data(task_path, ep_idx)
+        json_data = self._get_episode_json_data(task_path, ep_idx)
+        return {"data": json_data["data"], "arrays": {}}
+
+    def close(self) -> None:
+        """关闭图像预读线程池，取消尚未开始的解码任务"""
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+
+    # @override
+    def convert(self) -> Iterable[tuple[str, int, int]]:
+        try:
+            yield from super().convert()
+        finally:
+            self.close()
 
     @cached_property
     def task_episode_jsonfile_paths(self) -> dict[Path, list[Path]]:
-        task_episode_paths = {}
-        for path in self.path_task_dict.keys():
-            if path.exists():
-                # 方法1: 尝试智能episode目录发现
-                episode_dirs = self._find_episode_directories_g1(path)
-                
-                if episode_dirs:
-                    # 找到了有规律的episode目录
-                    json_files = []
-                    for episode_dir in episode_dirs:
-                        # 在每个episode目录中查找JSON文件
-                        episode_json_files = list(episode_dir.rglob("*.json"))
-                        if episode_json_files:
-                            # 选择主要的数据文件
-                            main_file = self._select_main_json_file(episode_json_files)
-                            json_files.append(main_file)
-                    
-                    if json_files:
-                        task_episode_paths[path] = json_files
-                        print(f"Found {len(json_files)} episodes using directory pattern in {path}")
-                        continue
-                
-                # 方法2: 回退到递归搜索
-                json_files = natsorted(list(path.rglob("*.json")))
-                task_episode_paths[path] = json_files
-                print(f"Found {len(json_files)} JSON files using recursive search in {path}")
-                
-        return task_episode_paths
+        task_paths = [path for path in self.path_task_dict.keys() if path.exists()]
+        if not task_paths:
+            return {}
+
+        # 各任务目录的扫描互不依赖且以IO为主，使用线程池并行扫描
+        with ThreadPoolExecutor(max_workers=min(8, len(task_paths))) as executor:
+            task_json_files = list(executor.map(self._find_task_episode_jsonfiles, task_paths))
+
+        return dict(zip(task_paths, task_json_files))
+
+    def _find_task_episode_jsonfiles(self, path: Path) -> list[Path]:
+        # 方法1: 尝试智能episode目录发现
+        # 目录发现时已收集各episode目录下的JSON文件，无需再次rglob
+        episode_dirs = self._find_episode_directories_with_json_g1(path)
+
+        if episode_dirs:
+            # 找到了有规律的episode目录，选择每个目录中主要的数据文件
+            json_files = [
+                self._select_main_json_file(episode_json_files)
+                for _, episode_json_files in episode_dirs
+            ]
+
+            if json_files:
+                if self._debug_enabled():
+                    self.logger.debug(
+                        f"Found {len(json_files)} episodes using directory pattern in {path}"
+                    )
+                return json_files
+
+        # 方法2: 回退到递归搜索
+        json_files = natsorted(list(path.rglob("*.json")))
+        if self._debug_enabled():
+            self.logger.debug(f"Found {len(json_files)} JSON files using recursive search in {path}")
+        return json_files
 
     def _group_images_by_camera_g1(self, jpg_files: list[Path]) -> dict[int, list[Path]]:
         """
@@ -295,40 +561,19 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         根据文件名模式将图像按相机分组：
         G1格式：*0.jpg, *1.jpg, *2.jpg, *3.jpg (文件名最后一位数字表示相机索引)
         """
-        import re
-        camera_groups = {}
-        
-        # G1相机文件名模式匹配：文件名最后一位数字表示相机索引
-        camera_pattern = r'.*(\d)\.jpe?g$'  # 匹配文件名最后一位数字
-        
-        for jpg_file in jpg_files:
-            match = re.match(camera_pattern, jpg_file.name, re.IGNORECASE)
-            if match:
-                camera_idx = int(match.group(1))
-                
-                if camera_idx not in camera_groups:
-                    camera_groups[camera_idx] = []
-                
-                camera_groups[camera_idx].append(jpg_file)
-        
-        # 对每个相机的图像按文件名排序
-        for camera_idx in camera_groups:
-            camera_groups[camera_idx] = natsorted(camera_groups[camera_idx], key=lambda x: x.name)
-        
-        # 按相机索引排序
-        return dict(sorted(camera_groups.items()))
+        return _group_images_by_camera(jpg_files)
 
-    def _extract_camera_index_from_key(self, image_key: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _extract_camera_index_from_key(image_key: str) -> int:
         """
-        从image_key提取相机索引
+        从image_key提取相机索引（每帧每个相机都会调用，结果按key缓存）
         color_0 -> 0
         color_1 -> 1
         camera_2 -> 2
         """
-        import re
-        
         # 提取key中的数字
-        match = re.search(r'(\d+)$', image_key)
+        match = _CAMERA_KEY_PATTERN.search(image_key)
         if match:
             return int(match.group(1))
         
@@ -367,7 +612,7 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         sample_images = []
         
         # 寻找样本图像文件
-        for jpg_file in dataset_path_obj.rglob("*.jpg"):
+        for jpg_file in _iter_images(dataset_path_obj):
             sample_images.append(jpg_file)
             if len(sample_images) >= 20:  # 取前20个文件作为样本
                 break
@@ -419,13 +664,17 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         return config
 
     def _find_episode_directories_g1(self, task_path: Path) -> list[Path]:
+        episode_dirs = self._find_episode_directories_with_json_g1(task_path)
+        return [episode_dir for episode_dir, _ in episode_dirs]
+
+    def _find_episode_directories_with_json_g1(
+        self, task_path: Path
+    ) -> list[tuple[Path, list[Path]]]:
         """
         在JPG+JSON转换器中实现智能episode目录发现
         支持多种episode目录命名模式：episode1, episode_1, ep1, ep_1, 001, 1等
         支持深度搜索，找到分散在不同子目录中的episode
         """
-        import re
-        
         # Episode目录匹配模式
         episode_patterns = [
             r'^episode(\d+)$',      # episode1, episode2, episode10
@@ -436,17 +685,19 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         ]
         
         # 递归搜索所有子目录（限制深度避免过深搜索）
+        # 使用os.scandir，目录项自带类型信息，避免为每个条目创建Path并额外stat
         def find_all_directories(root_path, max_depth=3, current_depth=0):
             dirs = []
             if current_depth >= max_depth:
                 return dirs
                 
             try:
-                for item in root_path.iterdir():
-                    if item.is_dir():
-                        dirs.append(item)
-                        # 递归搜索子目录
-                        dirs.extend(find_all_directories(item, max_depth, current_depth + 1))
+                with os.scandir(root_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            dirs.append((entry.name, entry.path))
+                            # 递归搜索子目录
+                            dirs.extend(find_all_directories(entry.path, max_depth, current_depth + 1))
             except (PermissionError, OSError):
                 pass  # 忽略权限或其他访问错误
             
@@ -455,30 +706,33 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         all_dirs = find_all_directories(task_path)
         episode_dirs = []
         
-        for directory in all_dirs:
-            dir_name = directory.name
-            
+        for dir_name, dir_path in all_dirs:
             # 检查是否匹配任何episode模式
             for pattern in episode_patterns:
                 match = re.match(pattern, dir_name, re.IGNORECASE)
                 if match:
                     episode_num = int(match.group(1))
                     
-                    # 检查目录中是否包含JSON文件（确保是有效的episode目录）
-                    json_files = list(directory.rglob("*.json"))
-                    if json_files:
-                        episode_dirs.append((episode_num, directory))
+                    # 检查目录中是否包含JSON文件（确保是有效的episode目录），
+                    # 同一次遍历收集到的JSON文件列表直接用于后续选择主数据文件
+                    episode_json_files = _list_json_files(dir_path)
+                    if episode_json_files:
+                        episode_dirs.append(
+                            (episode_num, dir_name, Path(dir_path), episode_json_files)
+                        )
                     break
         
         if episode_dirs:
             # 按episode编号排序，然后按目录名排序（处理相同编号的情况）
-            episode_dirs.sort(key=lambda x: (x[0], x[1].name))
-            sorted_dirs = [d[1] for d in episode_dirs]
+            # 排序键在收集时已物化，比较时无需访问Path属性
+            episode_dirs.sort(key=itemgetter(0, 1))
+            sorted_dirs = [(d[2], d[3]) for d in episode_dirs]
             
-            print(f"Found episode directories in {task_path}:")
-            for i, dir_path in enumerate(sorted_dirs):
-                relative_path = dir_path.relative_to(task_path) if dir_path.is_relative_to(task_path) else dir_path
-                print(f"  Episode {i}: {dir_path.name} at {relative_path}")
+            if self._debug_enabled():
+                self.logger.debug(f"Found episode directories in {task_path}:")
+                for i, (dir_path, _) in enumerate(sorted_dirs):
+                    relative_path = dir_path.relative_to(task_path) if dir_path.is_relative_to(task_path) else dir_path
+                    self.logger.debug(f"  Episode {i}: {dir_path.name} at {relative_path}")
             
             return sorted_dirs
         
@@ -491,56 +745,90 @@ class LerobotFormatConverterG1(LerobotFormatConverter):
         """
         if len(json_files) == 1:
             return json_files[0]
-        
-        # 优先级规则：
+
+        # 优先级规则（单次遍历取最小值）：
         # 1. 文件名包含"data"的文件
-        # 2. 文件名包含"episode"的文件  
-        # 3. 文件名最短的文件（通常是主文件）
+        # 2. 文件名包含"episode"的文件
+        # 3. 同类中文件名最短的文件（通常是主文件）
         # 4. 按字母顺序第一个文件
-        
-        priority_files = []
-        
-        # 检查包含"data"的文件
-        for f in json_files:
-            if "data" in f.name.lower():
-                priority_files.append((1, f))
-        
-        # 检查包含"episode"的文件
-        if not priority_files:
-            for f in json_files:
-                if "episode" in f.name.lower():
-                    priority_files.append((2, f))
-        
-        # 按文件名长度排序
-        if not priority_files:
-            for f in json_files:
-                priority_files.append((len(f.name), f))
-        
-        # 选择优先级最高的文件
-        priority_files.sort(key=lambda x: x[0])
-        selected_file = priority_files[0][1]
-        
-        print(f"Selected main JSON file: {selected_file.name}")
+        def priority(f: Path) -> tuple[int, int, str]:
+            name = f.name.lower()
+            category = 0 if "data" in name else 1 if "episode" in name else 2
+            return (category, len(f.name), f.name)
+
+        selected_file = min(json_files, key=priority)
+
+        if self._debug_enabled():
+            self.logger.debug(f"Selected main JSON file: {selected_file.name}")
         return selected_file
 
     def _get_episode_json_data(self, task_path: Path, ep_idx: int) -> any:
-        should_load = self.g1_buffer.task_path != task_path or self.g1_buffer.ep_idx != ep_idx
-        if not should_load:
-            print(f"buffer is ok, skipping Loading episode {ep_idx} from {task_path}")
-            return self.g1_buffer.g1_data
+        cache_key = (task_path, ep_idx)
+        json_data = self._episode_cache.get(cache_key)
+        if json_data is not None:
+            self._episode_cache.move_to_end(cache_key)
+            if self._debug_enabled():
+                self.logger.debug(
+                    f"buffer is ok, skipping Loading episode {ep_idx} from {task_path}"
+                )
+            return json_data
+
+        json_data = self._take_prefetched_json_data(cache_key)
+        if json_data is None:
+            json_file_path = self.task_episode_jsonfile_paths[task_path][ep_idx]
+            try:
+                json_data = _fast_json_load(json_file_path)
+            except Exception as e:
+                raise ValueError(f"Error while reading json file {json_file_path}: {e}")
+
+        # 缓存JSON数据
+        self._episode_cache[cache_key] = json_data
+        if len(self._episode_cache) > self._episode_cache_size:
+            self._episode_cache.popitem(last=False)
 
+        self._start_json_prefetch(task_path, ep_idx + 1)
+
+        if self._debug_enabled():
+            self.logger.debug(
+                f"json_file loaded, total frames: {len(json_data.get('data', []))}"
+            )
+        return json_data
+
+    def _take_prefetched_json_data(self, cache_key: tuple[Path, int]) -> dict | None:
+        """取出后台预读的JSON数据；若预读线程正在加载该episode，则等待其完成"""
+        prefetch_thread = self._prefetch_thread
+        if prefetch_thread is not None and self._prefetch_key == cache_key:
+            prefetch_thread.join()
+        with self._prefetch_lock:
+            return self._prefetched.pop(cache_key, None)
+
+    def _start_json_prefetch(self, task_path: Path, ep_idx: int) -> None:
+        """启动单个后台线程预读指定episode的JSON（上一个预读未完成时不再启动）"""
+        cache_key = (task_path, ep_idx)
+        if ep_idx >= len(self.task_episode_jsonfile_paths.get(task_path, [])):
+            return
+        if cache_key in self._episode_cache:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        with self._prefetch_lock:
+            if cache_key in self._prefetched:
+                return
+            # 只保留一个预读槽位，丢弃未被使用的旧结果
+            self._prefetched.clear()
+
+        self._prefetch_key = cache_key
+        self._prefetch_thread = threading.Thread(
+            target=self._bg_load_json_data, args=cache_key, daemon=True
+        )
+        self._prefetch_thread.start()
+
+    def _bg_load_json_data(self, task_path: Path, ep_idx: int) -> None:
         json_file_path = self.task_episode_jsonfile_paths[task_path][ep_idx]
         try:
-            with open(json_file_path, "r", encoding='utf-8') as json_file:
-                json_data = json.load(json_file)
-                
-                # 缓存JSON数据
-                self.g1_buffer.g1_data = json_data
-                self.g1_buffer.task_path = task_path
-                self.g1_buffer.ep_idx = ep_idx
-                
-                print("json_file loaded")
-                print(f"Total frames: {len(json_data.get('data', []))}")
-                return json_data
-        except Exception as e:
-            raise ValueError(f"Error while reading json file {json_file_path}: {e}")
+            json_data = _fast_json_load(json_file_path)
+        except Exception:
+            # 预读失败不影响主流程，真正需要时会在主线程重新加载并报错
+            return
+        with self._prefetch_lock:
+            self._prefetched[(task_path, ep_idx)] = json_data
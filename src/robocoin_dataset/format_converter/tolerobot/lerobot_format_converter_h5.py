@@ -1,31 +1,78 @@
-import io
+import gc
 import logging
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
 
 import h5py
 import numpy as np
-from natsort import natsorted
-from PIL import Image
 
 from robocoin_dataset.format_converter.tolerobot.constant import (
+    ACTION_KEY,
     ARGS_KEY,
     FEATURES_KEY,
+    IMAGE_KEY,
     OBSERVATION_KEY,
     STATE_KEY,
+    SUB_ACTION_KEY,
     SUB_STATE_KEY,
 )
 from robocoin_dataset.format_converter.tolerobot.lerobot_format_converter import (
     LerobotFormatConverter,
 )
+from robocoin_dataset.format_converter.utils.frame_prefetcher import FramePrefetcher
+from robocoin_dataset.format_converter.utils.h5_files import find_h5_files
+from robocoin_dataset.format_converter.utils.image_decoder import decode_image_bytes
+
+# HDF5 raw data chunk cache settings used when opening episode files.
+# The default cache (1 MiB / 521 slots) cannot hold a single multi-MB image chunk,
+# so chunks are re-read when several h5_paths are visited per frame. The slot count
+# is a prime well above 10x the expected chunk count of an episode.
+H5_RDCC_NBYTES = 128 * 1024 * 1024
+H5_RDCC_NSLOTS = 10007
+H5_RDCC_W0 = 0.75
+# Number of HDF5 files kept open between validation, frame counting and loading
+H5_OPEN_FILES_CACHE_SIZE = 4
+# Run a full garbage collection every N loaded episodes to keep RSS flat on long runs
+H5_GC_INTERVAL = 16
 
 
 @dataclass
 class H5Buffer:
-    h5_data: dict | None = None
+    """
+    Datasets of the current episode file.
+    Datasets are kept as lazy h5py.Dataset handles, so only the rows that are
+    actually indexed are read from disk. The file handle itself is owned by the
+    converter's open-file cache.
+    """
+
+    h5_file: h5py.File | None = None
+    datasets: dict[str, h5py.Dataset] | None = None
     task_path: Path | None = None
     ep_idx: int | None = None
+    # h5_path -> whole state/action dataset, read once per episode
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+    # (h5_path, range_from, range_to) -> [T, D] view into columns
+    views: dict[tuple[str, int, int], np.ndarray] = field(default_factory=dict)
+    # h5_path -> background decoder of the upcoming frames of an image dataset
+    prefetchers: dict[str, FramePrefetcher] = field(default_factory=dict)
+    # h5_path -> whether frames can be read as raw chunks (see _supports_direct_chunk_read)
+    direct_chunk: dict[str, bool] = field(default_factory=dict)
+
+    def clear(self) -> None:
+        self.h5_file = None
+        self.datasets = None
+        self.columns.clear()
+        self.views.clear()
+        self.direct_chunk.clear()
+        for prefetcher in self.prefetchers.values():
+            prefetcher.clear()
+        self.prefetchers.clear()
+        self.task_path = None
+        self.ep_idx = None
 
 
 class LerobotFormatConverterHdf5(LerobotFormatConverter):
@@ -40,11 +87,32 @@ class LerobotFormatConverterHdf5(LerobotFormatConverter):
         video_backend: str = "pyav",
         image_writer_processes: int = 4,
         image_writer_threads: int = 4,
+        image_prefetch_window: int = 8,
     ) -> None:
         self.h5_buffer: H5Buffer = H5Buffer()
-        
+        self._h5_files: OrderedDict[Path, h5py.File] = OrderedDict()
+        self._loaded_episodes_num = 0
+        # (task_path, ep_idx) -> number of frames, read from the dataset shape once
+        self._episode_frames_num: dict[tuple[Path, int], int] = {}
+        # h5_path -> array reused by read_direct for state/action columns
+        self._reuse_buffers: dict[str, np.ndarray] = {}
+        # JPEG decoding releases the GIL, so upcoming frames are decoded on a thread
+        # pool while the current frame is processed; 0 disables prefetching
+        self._image_prefetch_window = max(0, image_prefetch_window)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, image_writer_threads))
+
+        # Walk the dataset once; the result serves both camera auto-detection and
+        # the per-task episode file lists
+        self._dataset_h5_files = find_h5_files(Path(dataset_path).expanduser().absolute())
+
         # Auto-detect cameras before calling super().__init__
         self._auto_detect_and_update_camera_config(converter_config, Path(dataset_path), logger)
+
+        # Datasets the config reads; only these are opened for each episode. The config
+        # does not change afterwards, so both are computed once here.
+        self._required_h5_paths = self._collect_required_h5_paths(converter_config)
+        # Dataset whose length gives the number of frames of an episode
+        self._frames_probe_path = self._get_frames_probe_path(converter_config)
         
         super().__init__(
             dataset_path=dataset_path,
@@ -66,13 +134,68 @@ class LerobotFormatConverterHdf5(LerobotFormatConverter):
         args_dict: dict,
         images_buffer: any = None,
     ) -> np.ndarray:
+        # Only buffers reused across the episode are worth prefetching; a buffer built
+        # here for a one-off read (e.g. the sample frame during init) is decoded directly
+        use_prefetch = bool(images_buffer) and self._image_prefetch_window > 0
         if not images_buffer:
             images_buffer = self._prepare_episode_images_buffer(task_path, ep_idx)
 
         h5_path = args_dict["h5_path"]
-        image_bytes = images_buffer[h5_path][frame_idx]
-        img = Image.open(io.BytesIO(image_bytes))
-        return np.array(img)
+        dataset = images_buffer[h5_path]
+        # Encoded frames are stored as (N,) variable-length or (N, L) padded bytes;
+        # (N, H, W[, C]) uint8 data already holds the pixels and needs no decoding
+        if dataset.ndim >= 3 and dataset.dtype == np.uint8:
+            return dataset[frame_idx]
+        if not use_prefetch or images_buffer is not self.h5_buffer.datasets:
+            return decode_image_bytes(self._read_encoded_frame(dataset, frame_idx))
+
+        prefetcher = self.h5_buffer.prefetchers.get(h5_path)
+        if prefetcher is None:
+            prefetcher = FramePrefetcher(
+                self._image_pool,
+                lambda idx: decode_image_bytes(self._read_encoded_frame(dataset, idx)),
+                self._image_prefetch_window,
+            )
+            self.h5_buffer.prefetchers[h5_path] = prefetcher
+        upcoming = range(frame_idx + 1, min(len(dataset), frame_idx + 1 + prefetcher.window))
+        return prefetcher.get(frame_idx, upcoming)
+
+    def _read_encoded_frame(self, dataset: h5py.Dataset, frame_idx: int) -> bytes | np.ndarray:
+        """
+        Read the encoded image bytes of one frame.
+        When every frame is stored in its own unfiltered chunk, the raw chunk is the
+        frame itself, so it is fetched with read_direct_chunk, bypassing the
+        selection and filter pipeline. Otherwise the row is read normally.
+        """
+        direct_chunk = self.h5_buffer.direct_chunk.get(dataset.name)
+        if direct_chunk is None:
+            direct_chunk = self._supports_direct_chunk_read(dataset)
+            self.h5_buffer.direct_chunk[dataset.name] = direct_chunk
+
+        if direct_chunk:
+            try:
+                filter_mask, chunk = dataset.id.read_direct_chunk(
+                    (frame_idx,) + (0,) * (dataset.ndim - 1)
+                )
+                if filter_mask == 0:
+                    return chunk
+            except (KeyError, OSError, ValueError):
+                # e.g. chunk not allocated; fall back to a regular read
+                pass
+        return dataset[frame_idx]
+
+    @staticmethod
+    def _supports_direct_chunk_read(dataset: h5py.Dataset) -> bool:
+        # Raw chunk bytes equal the frame bytes only for fixed-size uint8 data with
+        # one whole frame per chunk and no filters (vlen chunks hold heap references)
+        return (
+            dataset.chunks is not None
+            and dataset.ndim >= 2
+            and dataset.dtype == np.uint8
+            and dataset.chunks[0] == 1
+            and dataset.chunks[1:] == dataset.shape[1:]
+            and dataset.id.get_create_plist().get_nfilters() == 0
+        )
 
     # @override
     def _get_frame_sub_states(
@@ -83,10 +206,9 @@ class LerobotFormatConverterHdf5(LerobotFormatConverter):
         args_dict: dict,
         sub_states_buffer: any = None,
     ) -> np.ndarray:
-        h5_path = args_dict["h5_path"]
-        from_idx = args_dict["range_from"]
-        to_idx = args_dict["range_to"]
-        return sub_states_buffer[h5_path][frame_idx][from_idx:to_idx]
+        if not sub_states_buffer:
+            sub_states_buffer = self._prepare_episode_states_buffer(task_path, ep_idx)
+        return self._get_frame_sub_view(sub_states_buffer, args_dict, frame_idx)
 
     # @override
     def _get_frame_sub_actions(
@@ -97,26 +219,93 @@ class LerobotFormatConverterHdf5(LerobotFormatConverter):
         args_dict: dict,
         sub_actions_buffer: any = None,
     ) -> np.ndarray:
-        h5_path = args_dict["h5_path"]
-        from_idx = args_dict["range_from"]
-        to_idx = args_dict["range_to"]
-        return sub_actions_buffer[h5_path][frame_idx][from_idx:to_idx]
+        if not sub_actions_buffer:
+            sub_actions_buffer = self._prepare_episode_actions_buffer(task_path, ep_idx)
+        return self._get_frame_sub_view(sub_actions_buffer, args_dict, frame_idx)
+
+    def _get_frame_sub_view(self, buffer: dict, args_dict: dict, frame_idx: int) -> np.ndarray:
+        """
+        Return the [range_from:range_to] slice of one frame.
+        The slice is a row of a per-episode [T, D] view, so each frame costs one
+        array lookup instead of an h5py read.
+        """
+        # Views are keyed by the slice itself, so any args dict describing the same
+        # slice shares one view, whatever config object it comes from
+        key = self._sub_view_key(args_dict)
+        if buffer is not self.h5_buffer.datasets:
+            h5_path, from_idx, to_idx = key
+            return buffer[h5_path][frame_idx][from_idx:to_idx]
+
+        view = self.h5_buffer.views.get(key)
+        if view is None:
+            view = self._build_sub_view(buffer, key)
+        return view[frame_idx]
+
+    def _build_sub_view(self, datasets: dict, key: tuple[str, int, int]) -> np.ndarray:
+        h5_path, from_idx, to_idx = key
+        column = self.h5_buffer.columns.get(h5_path)
+        if column is None:
+            column = self._read_column(h5_path, datasets[h5_path])
+            self.h5_buffer.columns[h5_path] = column
+        view = column[:, from_idx:to_idx]
+        self.h5_buffer.views[key] = view
+        return view
+
+    def _read_column(self, h5_path: str, dataset: h5py.Dataset) -> np.ndarray:
+        """
+        Read a whole state/action dataset into a buffer reused across episodes.
+        Trajectories usually have the same length and dtype from episode to episode,
+        so read_direct can fill the previous episode's array instead of allocating.
+        The previous contents are no longer referenced: frame values handed to
+        LeRobot are concatenated copies, and the H5Buffer views are cleared first.
+        """
+        if dataset.size == 0:
+            return dataset[()]
+        column = self._reuse_buffers.get(h5_path)
+        if column is None or column.shape != dataset.shape or column.dtype != dataset.dtype:
+            column = np.empty(dataset.shape, dtype=dataset.dtype)
+            self._reuse_buffers[h5_path] = column
+        dataset.read_direct(column)
+        return column
+
+    def _prepare_sub_views(self, datasets: dict, sub_configs: list[dict]) -> None:
+        """
+        Read every configured state/action dataset once and slice its views.
+        """
+        for sub_config in sub_configs:
+            key = self._sub_view_key(sub_config[ARGS_KEY])
+            if key not in self.h5_buffer.views:
+                self._build_sub_view(datasets, key)
 
     # @override
     def _get_episode_frames_num(self, task_path: Path, ep_idx: int) -> int:
-        args = self.converter_config[FEATURES_KEY][OBSERVATION_KEY][STATE_KEY][SUB_STATE_KEY][0][
-            ARGS_KEY
-        ]
-        if "h5_path" not in args:
+        h5_path = self._frames_probe_path
+        if h5_path is None:
             raise ValueError("h5_path is not specified in the config")
-        h5_path = args["h5_path"]
+
+        frames_num = self._episode_frames_num.get((task_path, ep_idx))
+        if frames_num is not None:
+            return frames_num
+
+        # The episode being converted already has its datasets open in the buffer
+        datasets = self.h5_buffer.datasets
+        if (
+            datasets is not None
+            and h5_path in datasets
+            and self.h5_buffer.task_path == task_path
+            and self.h5_buffer.ep_idx == ep_idx
+        ):
+            frames_num = datasets[h5_path].shape[0]
+            self._episode_frames_num[(task_path, ep_idx)] = frames_num
+            return frames_num
 
         h5_file_path = self.task_episode_h5file_paths[task_path][ep_idx]
         try:
-            with h5py.File(h5_file_path, "r") as h5_file:
-                return h5_file[h5_path].shape[0]
+            frames_num = self._open_h5(h5_file_path)[h5_path].shape[0]
         except Exception as e:
             raise ValueError(f"Error while reading h5 file {h5_file_path}: {e}")
+        self._episode_frames_num[(task_path, ep_idx)] = frames_num
+        return frames_num
 
     # @override
     def _get_task_episodes_num(self, task_path: Path) -> int:
@@ -128,45 +317,158 @@ class LerobotFormatConverterHdf5(LerobotFormatConverter):
 
     # @override
     def _prepare_episode_states_buffer(self, task_path: Path, ep_idx: int) -> any:
-        return self._get_episode_h5_data(task_path, ep_idx)
+        datasets = self._get_episode_h5_data(task_path, ep_idx)
+        self._prepare_sub_views(
+            datasets, self.converter_config[FEATURES_KEY][OBSERVATION_KEY][STATE_KEY][SUB_STATE_KEY]
+        )
+        return datasets
 
     # @override
     def _prepare_episode_actions_buffer(self, task_path: Path, ep_idx: int) -> any:
-        return self._get_episode_h5_data(task_path, ep_idx)
+        datasets = self._get_episode_h5_data(task_path, ep_idx)
+        self._prepare_sub_views(
+            datasets, self.converter_config[FEATURES_KEY][ACTION_KEY][SUB_ACTION_KEY]
+        )
+        return datasets
 
     @cached_property
     def task_episode_h5file_paths(self) -> dict[Path, list[Path]]:
-        task_episode_paths = {}
-        for path in self.path_task_dict.keys():
-            if path.exists():
-                h5_files = natsorted(list(path.rglob("*.h5")))
-                h5_files.extend(natsorted(list(path.rglob("*.hdf5"))))
-                task_episode_paths[path] = h5_files
+        task_paths = [path for path in self.path_task_dict.keys() if path.exists()]
+        task_episode_paths = {path: [] for path in task_paths}
+
+        # Assign each file of the initial dataset walk to its task directory instead
+        # of walking every task directory again; the natural order is preserved
+        for h5_file in self._dataset_h5_files:
+            for parent in h5_file.parents:
+                if parent in task_episode_paths:
+                    task_episode_paths[parent].append(h5_file)
+                    break
         return task_episode_paths
 
     def _get_episode_h5_data(self, task_path: Path, ep_idx: int) -> any:
         should_load = self.h5_buffer.task_path != task_path or self.h5_buffer.ep_idx != ep_idx
         if not should_load:
-            return self.h5_buffer.h5_data
-        self.h5_buffer.h5_data = {}
+            return self.h5_buffer.datasets
+
+        # Episodes are converted in order, so the previous episode file is not read
+        # again: drop every reference to its data and close it right away instead of
+        # leaving it (and its chunk caches) to the LRU
+        previous_file = self.h5_buffer.h5_file
+        self.h5_buffer.clear()
+        if previous_file is not None:
+            self._close_h5(previous_file)
+        self._loaded_episodes_num += 1
+        if self._loaded_episodes_num % H5_GC_INTERVAL == 0:
+            gc.collect()
 
-        def _get_dataset(name: str, obj: any) -> None:
-            if isinstance(obj, h5py.Dataset):
-                self.h5_buffer.h5_data[name] = obj[()]
+        h5_file_path = self.task_episode_h5file_paths[task_path][ep_idx]
+        h5_file = self._open_h5(h5_file_path)
+        # Look up only the datasets the config needs instead of visiting every node
+        datasets = {}
+        for h5_path in self._required_h5_paths:
+            if h5_path not in h5_file:
+                raise ValueError(f"Dataset {h5_path} not found in h5 file {h5_file_path}")
+            datasets[h5_path] = h5_file[h5_path]
 
-        with h5py.File(self.task_episode_h5file_paths[task_path][ep_idx]) as h5_file:
-            h5_file.visititems(_get_dataset)
-            self.h5_buffer.task_path = task_path
-            self.h5_buffer.ep_idx = ep_idx
+        self.h5_buffer.h5_file = h5_file
+        self.h5_buffer.datasets = datasets
+        self.h5_buffer.task_path = task_path
+        self.h5_buffer.ep_idx = ep_idx
 
-        return self.h5_buffer.h5_data
+        return self.h5_buffer.datasets
+
+    @staticmethod
+    def _collect_required_h5_paths(converter_config: dict) -> frozenset[str]:
+        features = converter_config.get(FEATURES_KEY, {})
+        observation = features.get(OBSERVATION_KEY, {})
+        feature_configs = [
+            *observation.get(IMAGE_KEY, []),
+            *observation.get(STATE_KEY, {}).get(SUB_STATE_KEY, []),
+            *features.get(ACTION_KEY, {}).get(SUB_ACTION_KEY, []),
+        ]
+        return frozenset(
+            feature_config[ARGS_KEY]["h5_path"]
+            for feature_config in feature_configs
+            if "h5_path" in feature_config.get(ARGS_KEY, {})
+        )
+
+    @staticmethod
+    def _sub_view_key(args_dict: dict) -> tuple[str, int, int]:
+        return (args_dict["h5_path"], args_dict["range_from"], args_dict["range_to"])
+
+    @staticmethod
+    def _get_frames_probe_path(converter_config: dict) -> str | None:
+        sub_states = (
+            converter_config.get(FEATURES_KEY, {})
+            .get(OBSERVATION_KEY, {})
+            .get(STATE_KEY, {})
+            .get(SUB_STATE_KEY, [])
+        )
+        if not sub_states:
+            return None
+        return sub_states[0].get(ARGS_KEY, {}).get("h5_path")
+
+    def _open_h5(self, h5_file_path: Path) -> h5py.File:
+        """
+        Return a cached read-only handle for the file, opening it if needed.
+        Opening an HDF5 file is expensive, and the same file is opened for camera
+        detection, frame counting and loading. The cache is a small LRU.
+        """
+        h5_file = self._h5_files.get(h5_file_path)
+        if h5_file is not None and h5_file.id.valid:
+            self._h5_files.move_to_end(h5_file_path)
+            return h5_file
+
+        h5_file = h5py.File(
+            h5_file_path,
+            "r",
+            rdcc_nbytes=H5_RDCC_NBYTES,
+            rdcc_nslots=H5_RDCC_NSLOTS,
+            rdcc_w0=H5_RDCC_W0,
+        )
+        self._h5_files[h5_file_path] = h5_file
+
+        # Evict the least recently used handles, but never the current episode file
+        for cached_path in list(self._h5_files):
+            if len(self._h5_files) <= H5_OPEN_FILES_CACHE_SIZE:
+                break
+            cached_file = self._h5_files[cached_path]
+            if cached_file is self.h5_buffer.h5_file or cached_file is h5_file:
+                continue
+            del self._h5_files[cached_path]
+            cached_file.close()
+        return h5_file
+
+    def _close_h5(self, h5_file: h5py.File) -> None:
+        for cached_path, cached_file in list(self._h5_files.items()):
+            if cached_file is h5_file:
+                del self._h5_files[cached_path]
+        if h5_file.id.valid:
+            h5_file.close()
+
+    def close(self) -> None:
+        """
+        Close all open HDF5 files and stop the image decode pool.
+        """
+        self.h5_buffer.clear()
+        for h5_file in self._h5_files.values():
+            h5_file.close()
+        self._h5_files.clear()
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+
+    # @override
+    def convert(self) -> Iterable[tuple[str, int, int]]:
+        try:
+            yield from super().convert()
+        finally:
+            self.close()
 
     def _auto_detect_and_update_camera_config(self, converter_config: dict, dataset_path: Path, logger: logging.Logger | None = None) -> None:
         """
         Auto-detect available cameras in HDF5 files and update the converter config accordingly.
         """
         # Find the first HDF5 file to inspect
-        h5_files = list(dataset_path.rglob("*.h5")) + list(dataset_path.rglob("*.hdf5"))
+        h5_files = self._dataset_h5_files
         if not h5_files:
             if logger:
                 logger.warning("No HDF5 files found for camera auto-detection")
@@ -177,44 +479,46 @@ class LerobotFormatConverterHdf5(LerobotFormatConverter):
             logger.info(f"Auto-detecting cameras from sample file: {sample_h5_file}")
         
         try:
-            with h5py.File(sample_h5_file, 'r') as h5_file:
-                # Check if observations/images exists
-                if 'observations' not in h5_file or 'images' not in h5_file['observations']:
-                    if logger:
-                        logger.warning("No observations/images group found in HDF5 file")
-                    return
-                
-                # Get available camera names
-                available_cameras = list(h5_file['observations/images'].keys())
+            h5_file = self._open_h5(sample_h5_file)
+            # Check if observations/images exists
+            if 'observations' not in h5_file or 'images' not in h5_file['observations']:
                 if logger:
-                    logger.info(f"Detected cameras: {available_cameras}")
-                
-                # Update the config to only include cameras that actually exist
-                if FEATURES_KEY in converter_config and OBSERVATION_KEY in converter_config[FEATURES_KEY]:
-                    if 'images' in converter_config[FEATURES_KEY][OBSERVATION_KEY]:
-                        original_cameras = converter_config[FEATURES_KEY][OBSERVATION_KEY]['images']
-                        updated_cameras = []
-                        
-                        for camera_config in original_cameras:
-                            if ARGS_KEY in camera_config and 'h5_path' in camera_config[ARGS_KEY]:
-                                h5_path = camera_config[ARGS_KEY]['h5_path']
-                                # Extract camera name from h5_path (e.g., "observations/images/cam_high" -> "cam_high")
-                                camera_name = h5_path.split('/')[-1]
-                                
-                                if camera_name in available_cameras:
-                                    updated_cameras.append(camera_config)
-                                    if logger:
-                                        logger.info(f"Keeping camera config: {camera_config.get('cam_name', camera_name)}")
-                                else:
-                                    if logger:
-                                        logger.warning(f"Removing camera config for non-existent camera: {camera_config.get('cam_name', camera_name)} (path: {h5_path})")
-                        
-                        # Update the config
-                        converter_config[FEATURES_KEY][OBSERVATION_KEY]['images'] = updated_cameras
-                        
-                        if logger:
-                            logger.info(f"Updated camera config to include {len(updated_cameras)} cameras")
-                
+                    logger.warning("No observations/images group found in HDF5 file")
+                return
+            
+            # Get available camera names
+            # The sample handle stays in the open-file cache, so if it is also the
+            # first episode it is not reopened; a set gives O(1) checks per camera
+            available_cameras = frozenset(h5_file['observations/images'].keys())
+            if logger:
+                logger.info(f"Detected cameras: {sorted(available_cameras)}")
+            
+            # Update the config to only include cameras that actually exist
+            if FEATURES_KEY in converter_config and OBSERVATION_KEY in converter_config[FEATURES_KEY]:
+                if 'images' in converter_config[FEATURES_KEY][OBSERVATION_KEY]:
+                    original_cameras = converter_config[FEATURES_KEY][OBSERVATION_KEY]['images']
+                    updated_cameras = []
+                    
+                    for camera_config in original_cameras:
+                        if ARGS_KEY in camera_config and 'h5_path' in camera_config[ARGS_KEY]:
+                            h5_path = camera_config[ARGS_KEY]['h5_path']
+                            # Extract camera name from h5_path (e.g., "observations/images/cam_high" -> "cam_high")
+                            camera_name = h5_path.split('/')[-1]
+                            
+                            if camera_name in available_cameras:
+                                updated_cameras.append(camera_config)
+                                if logger:
+                                    logger.info(f"Keeping camera config: {camera_config.get('cam_name', camera_name)}")
+                            else:
+                                if logger:
+                                    logger.warning(f"Removing camera config for non-existent camera: {camera_config.get('cam_name', camera_name)} (path: {h5_path})")
+                    
+                    # Update the config
+                    converter_config[FEATURES_KEY][OBSERVATION_KEY]['images'] = updated_cameras
+                    
+                    if logger:
+                        logger.info(f"Updated camera config to include {len(updated_cameras)} cameras")
+            
         except Exception as e:
             if logger:
                 logger.error(f"Error during camera auto-detection: {e}")
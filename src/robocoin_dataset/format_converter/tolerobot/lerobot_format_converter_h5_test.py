@@ -1,31 +1,54 @@
-import io
 import logging
-from dataclasses import dataclass
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
 
 import h5py
 import numpy as np
-from natsort import natsorted
-from PIL import Image
 
 from robocoin_dataset.format_converter.tolerobot.constant import (
+    ACTION_KEY,
     ARGS_KEY,
     FEATURES_KEY,
+    IMAGE_KEY,
     OBSERVATION_KEY,
     STATE_KEY,
+    SUB_ACTION_KEY,
     SUB_STATE_KEY,
 )
 from robocoin_dataset.format_converter.tolerobot.lerobot_format_converter import (
     LerobotFormatConverter,
 )
+from robocoin_dataset.format_converter.utils.frame_prefetcher import FramePrefetcher
+from robocoin_dataset.format_converter.utils.h5_files import find_h5_files
+from robocoin_dataset.format_converter.utils.image_decoder import decode_image_bytes
 
 
 @dataclass
 class H5Buffer:
+    # Episode file, kept open until the episode changes
+    h5_file: h5py.File | None = None
     h5_data: dict | None = None
     task_path: Path | None = None
     ep_idx: int | None = None
+    # h5_path -> background decoder of the upcoming frames of an image dataset
+    prefetchers: dict[str, FramePrefetcher] = field(default_factory=dict)
+    # h5_paths whose frames are stored as raw (H, W[, C]) pixels rather than encoded bytes
+    raw_images: set[str] = field(default_factory=set)
+
+    def clear(self) -> None:
+        for prefetcher in self.prefetchers.values():
+            prefetcher.clear()
+        self.prefetchers.clear()
+        self.raw_images.clear()
+        self.h5_data = None
+        self.task_path = None
+        self.ep_idx = None
+        if self.h5_file is not None:
+            self.h5_file.close()
+            self.h5_file = None
 
 
 class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
@@ -40,8 +63,15 @@ class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
         video_backend: str = "pyav",
         image_writer_processes: int = 4,
         image_writer_threads: int = 4,
+        image_prefetch_window: int = 8,
     ) -> None:
         self.h5_buffer: H5Buffer = H5Buffer()
+        # Each frame is read twice per conversion (frame generation and LeRobot data),
+        # so frames are decoded once, ahead of time, on a thread pool
+        self._image_prefetch_window = max(0, image_prefetch_window)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, image_writer_threads))
+        # Datasets the config reads; only these are loaded for each episode
+        self._required_h5_paths = self._collect_required_h5_paths(converter_config)
         super().__init__(
             dataset_path=dataset_path,
             output_path=output_path,
@@ -62,13 +92,30 @@ class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
         args_dict: dict,
         images_buffer: any = None,
     ) -> np.ndarray:
+        use_prefetch = bool(images_buffer) and self._image_prefetch_window > 0
         if not images_buffer:
             images_buffer = self._prepare_episode_images_buffer(task_path, ep_idx)
 
         h5_path = args_dict["h5_path"]
-        image_bytes = images_buffer[h5_path][frame_idx]
-        img = Image.open(io.BytesIO(image_bytes))
-        return np.array(img)
+        frames = images_buffer[h5_path]
+        if images_buffer is self.h5_buffer.h5_data:
+            if h5_path in self.h5_buffer.raw_images:
+                return frames[frame_idx]
+        elif self._is_raw_image_dataset(frames):
+            return frames[frame_idx]
+        if not use_prefetch or images_buffer is not self.h5_buffer.h5_data:
+            return decode_image_bytes(frames[frame_idx])
+
+        prefetcher = self.h5_buffer.prefetchers.get(h5_path)
+        if prefetcher is None:
+            prefetcher = FramePrefetcher(
+                self._image_pool,
+                lambda idx: decode_image_bytes(frames[idx]),
+                self._image_prefetch_window,
+            )
+            self.h5_buffer.prefetchers[h5_path] = prefetcher
+        upcoming = range(frame_idx + 1, min(len(frames), frame_idx + 1 + prefetcher.window))
+        return prefetcher.get(frame_idx, upcoming)
 
     # @override
     def _get_frame_sub_states(
@@ -79,10 +126,9 @@ class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
         args_dict: dict,
         sub_states_buffer: any = None,
     ) -> np.ndarray:
-        h5_path = args_dict["h5_path"]
-        from_idx = args_dict["range_from"]
-        to_idx = args_dict["range_to"]
-        return sub_states_buffer[h5_path][frame_idx][from_idx:to_idx]
+        if not sub_states_buffer:
+            sub_states_buffer = self._prepare_episode_states_buffer(task_path, ep_idx)
+        return self._get_frame_sub_slice(sub_states_buffer, args_dict, frame_idx)
 
     # @override
     def _get_frame_sub_actions(
@@ -91,13 +137,15 @@ class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
         ep_idx: int,
         frame_idx: int,
         args_dict: dict,
-        names_num: int,
         sub_actions_buffer: any = None,
     ) -> np.ndarray:
-        h5_path = args_dict["h5_path"]
-        from_idx = args_dict["range_from"]
-        to_idx = args_dict["range_to"]
-        return sub_actions_buffer[h5_path][frame_idx][from_idx:to_idx]
+        if not sub_actions_buffer:
+            sub_actions_buffer = self._prepare_episode_actions_buffer(task_path, ep_idx)
+        return self._get_frame_sub_slice(sub_actions_buffer, args_dict, frame_idx)
+
+    def _get_frame_sub_slice(self, buffer: dict, args_dict: dict, frame_idx: int) -> np.ndarray:
+        h5_path, columns = self._sub_slice(args_dict)
+        return buffer[h5_path][frame_idx][columns]
 
     # @override
     def _get_episode_frames_num(self, task_path: Path, ep_idx: int) -> int:
@@ -108,6 +156,14 @@ class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
             raise ValueError("h5_path is not specified in the config")
         h5_path = args["h5_path"]
 
+        # The episode being converted already has its file open in the buffer
+        if (
+            self.h5_buffer.h5_file is not None
+            and self.h5_buffer.task_path == task_path
+            and self.h5_buffer.ep_idx == ep_idx
+        ):
+            return self.h5_buffer.h5_file[h5_path].shape[0]
+
         h5_file_path = self.task_episode_h5file_paths[task_path][ep_idx]
         try:
             with h5py.File(h5_file_path, "r") as h5_file:
@@ -136,24 +192,128 @@ class LerobotFormatConverterHdf5Test(LerobotFormatConverter):
         task_episode_paths = {}
         for path in self.path_task_dict.keys():
             if path.exists():
-                h5_files = natsorted(list(path.rglob("*.h5")))
-                h5_files.extend(natsorted(list(path.rglob("*.hdf5"))))
-                task_episode_paths[path] = h5_files
+                # one directory walk collects both .h5 and .hdf5 files
+                task_episode_paths[path] = find_h5_files(path)
         return task_episode_paths
 
     def _get_episode_h5_data(self, task_path: Path, ep_idx: int) -> any:
         should_load = self.h5_buffer.task_path != task_path or self.h5_buffer.ep_idx != ep_idx
         if not should_load:
             return self.h5_buffer.h5_data
-        self.h5_buffer.h5_data = {}
+        # Close the previous episode file only now that another episode is needed
+        self.h5_buffer.clear()
 
-        def _get_dataset(name: str, obj: any) -> None:
-            if isinstance(obj, h5py.Dataset):
-                self.h5_buffer.h5_data[name] = obj[()]
+        h5_file_path = self.task_episode_h5file_paths[task_path][ep_idx]
+        h5_file = h5py.File(h5_file_path, "r")
+        try:
+            # Read only the datasets the config needs instead of visiting every node
+            datasets = {}
+            for h5_path in self._required_h5_paths:
+                if h5_path not in h5_file:
+                    raise ValueError(f"Dataset {h5_path} not found in h5 file {h5_file_path}")
+                datasets[h5_path] = h5_file[h5_path]
+            h5_data = self._load_datasets(h5_file_path, datasets)
+        except Exception:
+            h5_file.close()
+            raise
+        self.h5_buffer.raw_images.update(
+            h5_path for h5_path, data in h5_data.items() if self._is_raw_image_dataset(data)
+        )
 
-        with h5py.File(self.task_episode_h5file_paths[task_path][ep_idx]) as h5_file:
-            h5_file.visititems(_get_dataset)
-            self.h5_buffer.task_path = task_path
-            self.h5_buffer.ep_idx = ep_idx
+        self.h5_buffer.h5_file = h5_file
+        self.h5_buffer.h5_data = h5_data
+        self.h5_buffer.task_path = task_path
+        self.h5_buffer.ep_idx = ep_idx
 
         return self.h5_buffer.h5_data
+
+    def close(self) -> None:
+        """
+        Close the open episode file and stop the image decode pool.
+        """
+        self.h5_buffer.clear()
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+
+    # @override
+    def convert(self) -> Iterable[tuple[str, int, int]]:
+        try:
+            yield from super().convert()
+        finally:
+            self.close()
+
+    @staticmethod
+    def _is_raw_image_dataset(data: np.ndarray) -> bool:
+        # Encoded frames are stored as (N,) variable-length or (N, L) padded bytes;
+        # (N, H, W[, C]) uint8 data already holds the pixels and needs no decoding
+        return data.ndim >= 3 and data.dtype == np.uint8
+
+    @staticmethod
+    def _memmap_dataset(h5_file_path: Path, dataset: h5py.Dataset) -> np.memmap | None:
+        """
+        Memory-map a contiguous, unfiltered fixed-size dataset straight from the file,
+        so only the pages of the frames that are actually read are paged in.
+        Returns None for chunked, compressed or variable-length datasets.
+        """
+        offset = dataset.id.get_offset() if dataset.chunks is None else None
+        if offset is None or h5py.check_vlen_dtype(dataset.dtype) is not None:
+            return None
+        return np.memmap(
+            h5_file_path, dtype=dataset.dtype, mode="r", offset=offset, shape=dataset.shape
+        )
+
+    @classmethod
+    def _load_datasets(
+        cls, h5_file_path: Path, datasets: dict[str, h5py.Dataset]
+    ) -> dict[str, np.ndarray]:
+        """
+        Load the referenced datasets of the episode.
+        Datasets that cannot be memory-mapped are read with read_direct. Per-frame 2D
+        datasets of the same group, dtype and length (e.g. joint, gripper and effort
+        streams) are read side by side into one preallocated [T, D1 + D2 + ...]
+        array, so a group costs a single allocation and each dataset is returned as
+        a column view of it.
+        """
+        h5_data = {}
+        groups: dict[tuple, list[tuple[str, h5py.Dataset]]] = {}
+        for h5_path, dataset in datasets.items():
+            data = cls._memmap_dataset(h5_file_path, dataset)
+            if data is not None:
+                h5_data[h5_path] = data
+            elif dataset.ndim == 2 and h5py.check_vlen_dtype(dataset.dtype) is None:
+                group_key = (dataset.parent.name, dataset.dtype, dataset.shape[0])
+                groups.setdefault(group_key, []).append((h5_path, dataset))
+            else:
+                data = np.empty(dataset.shape, dtype=dataset.dtype)
+                if dataset.size:
+                    dataset.read_direct(data)
+                h5_data[h5_path] = data
+
+        for (_, dtype, frames_num), members in groups.items():
+            out = np.empty((frames_num, sum(ds.shape[1] for _, ds in members)), dtype=dtype)
+            from_idx = 0
+            for h5_path, dataset in members:
+                to_idx = from_idx + dataset.shape[1]
+                if dataset.size:
+                    dataset.read_direct(out, dest_sel=np.s_[:, from_idx:to_idx])
+                h5_data[h5_path] = out[:, from_idx:to_idx]
+                from_idx = to_idx
+        return h5_data
+
+    @staticmethod
+    def _sub_slice(args_dict: dict) -> tuple[str, slice]:
+        return args_dict["h5_path"], slice(args_dict["range_from"], args_dict["range_to"])
+
+    @staticmethod
+    def _collect_required_h5_paths(converter_config: dict) -> frozenset[str]:
+        features = converter_config.get(FEATURES_KEY, {})
+        observation = features.get(OBSERVATION_KEY, {})
+        feature_configs = [
+            *observation.get(IMAGE_KEY, []),
+            *observation.get(STATE_KEY, {}).get(SUB_STATE_KEY, []),
+            *features.get(ACTION_KEY, {}).get(SUB_ACTION_KEY, []),
+        ]
+        return frozenset(
+            feature_config[ARGS_KEY]["h5_path"]
+            for feature_config in feature_configs
+            if "h5_path" in feature_config.get(ARGS_KEY, {})
+        )
@@ -1,16 +1,20 @@
 import logging
+import mmap
+import os
 import struct
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Any
 
 import numpy as np
-from PIL import Image
 from natsort import natsorted
 
 from robocoin_dataset.format_converter.tolerobot.constant import (
     ARGS_KEY,
     FEATURES_KEY,
+    IMAGE_KEY,
     OBSERVATION_KEY,
     STATE_KEY,
     SUB_STATE_KEY,
@@ -20,105 +24,300 @@ from robocoin_dataset.format_converter.tolerobot.constant import (
 from robocoin_dataset.format_converter.tolerobot.lerobot_format_converter import (
     LerobotFormatConverter,
 )
+from robocoin_dataset.format_converter.utils.frame_prefetcher import FramePrefetcher
+from robocoin_dataset.format_converter.utils.image_decoder import (
+    decode_image_file,
+    readahead_files,
+)
+
+try:
+    # PyMongo自带的bson包（C扩展），独立的bson包没有decode，会回退到纯Python解析
+    from bson import decode as _bson_decode
+
+    HAS_BSON = True
+except ImportError:
+    HAS_BSON = False
+
+
+# 预编译的BSON数值解析器，避免每次调用struct.unpack时重新解析格式字符串
+_UINT32 = struct.Struct('<I')
+_INT32 = struct.Struct('<i')
+_INT64 = struct.Struct('<q')
+_DOUBLE = struct.Struct('<d')
+_unpack_uint32 = _UINT32.unpack_from
+_unpack_int32 = _INT32.unpack_from
+_unpack_int64 = _INT64.unpack_from
+_unpack_double = _DOUBLE.unpack_from
+
+# 定长BSON类型的值长度（字节）：double、ObjectId、bool、UTC时间、null、int32、时间戳、int64、decimal128
+_BSON_FIXED_SIZES = {
+    0x01: 8, 0x07: 12, 0x08: 1, 0x09: 8, 0x0A: 0, 0x10: 4, 0x11: 8, 0x12: 8, 0x13: 16
+}
+
+# 字段名原始字节 -> 解码后的字符串；字段名来自固定的数据结构，重复出现的名称只解码一次并共享同一对象
+_NAME_CACHE: Dict[bytes, str] = {}
+# 名称缓存的上限，防止异常数据（如以数据为键的文档）使缓存无限增长
+_NAME_CACHE_LIMIT = 4096
+
+MAIN_BSON_FILE = "episode_0(8).bson"
+HAND_BSON_FILE = "xhand_control_data(7).bson"
+# 图像配置未指明camera_dir时扫描的默认相机目录
+DEFAULT_CAMERA_DIRS = ("camera_0", "camera_1", "camera_2")
 
 
 @dataclass
 class Mmk2Buffer:
-    """MMK2数据缓冲区"""
+    """
+    MMK2数据缓冲区，缓存当前episode已解析的数据
+    各字段在首次使用时才加载，切换episode时整体替换
+    """
     main_bson_data: Dict[str, List[Dict]] = None  # episode_0(8).bson数据
-    hand_bson_data: List[Dict] = None             # xhand_control_data(7).bson数据
+    hand_bson_data: List[Dict] = None             # xhand_control_data(7).bson数据（按data_path展平）
     camera_groups: Dict[str, List[Path]] = None   # 相机图像文件组
+    main_bson_raw: bytes | mmap.mmap = None       # 主BSON文件原始内容（只读内存映射）
+    main_data_index: Dict[str, tuple[int, int, int]] = None  # data下各数据路径的(类型, 偏移, 长度)
+    # (data_path, field) -> 按帧堆叠的(帧数, 维度) float32数组；各帧长度不一致时为None
+    main_columns: Dict[tuple[str, str], np.ndarray | None] = field(default_factory=dict)
     task_path: Path = None
     ep_idx: int = None
+    # camera_dir -> 后台预读解码该相机后续帧的预读器
+    prefetchers: Dict[str, FramePrefetcher] = field(default_factory=dict)
+
+    def close(self) -> None:
+        """取消未完成的图像预读，释放主BSON文件的内存映射"""
+        for prefetcher in self.prefetchers.values():
+            prefetcher.clear()
+        self.prefetchers.clear()
+        if isinstance(self.main_bson_raw, mmap.mmap):
+            self.main_bson_raw.close()
+        self.main_bson_raw = None
+        self.main_data_index = None
 
 
-def parse_bson_document(data: bytes, offset: int = 0) -> tuple[Dict, int]:
-    """解析单个BSON文档"""
+def _decode_field_name(raw: bytes) -> str:
+    """解码BSON字段名，已出现过的名称直接复用缓存的字符串"""
+    name = _NAME_CACHE.get(raw)
+    if name is None:
+        name = raw.decode('utf-8', errors='ignore')
+        if len(_NAME_CACHE) < _NAME_CACHE_LIMIT:
+            _NAME_CACHE[raw] = name
+    return name
+
+
+def _parse_bson_double_array(data: bytes, offset: int, doc_end: int) -> np.ndarray | None:
+    """
+    将元素全为double的BSON数组直接读为float64数组，不为每个元素创建Python float
+    数组元素依次为：类型(1字节) + 索引键 + 0x00 + 8字节值；索引键位数相同的一段元素间隔固定，
+    可用跨步视图整段读出。元素不全是double时返回None
+    """
+    pos = offset + 4
+    if pos >= doc_end - 1 or data[pos] != 0x01:
+        return None
+    
+    segments = []
+    index = 0
+    digits = 1
+    while pos < doc_end - 1:
+        stride = digits + 10
+        segment_size = 10 ** digits - index
+        count = min(segment_size, (doc_end - 1 - pos) // stride)
+        if count == 0:
+            return None
+        # 每个元素的类型字节必须是double，索引键之后必须是结束符
+        types = np.ndarray((count,), np.uint8, data, pos, (stride,))
+        name_ends = np.ndarray((count,), np.uint8, data, pos + 1 + digits, (stride,))
+        if (types != 0x01).any() or name_ends.any():
+            return None
+        segments.append(np.ndarray((count,), '<f8', data, pos + 2 + digits, (stride,)))
+        pos += count * stride
+        index += count
+        if count < segment_size:
+            break
+        digits += 1
+    if pos != doc_end - 1:
+        return None
+    # 拷贝出连续数组，不再引用原始缓冲区（内存映射可随时关闭）
+    return np.concatenate(segments).astype(np.float64, copy=False)
+
+
+def parse_bson_document(
+    data: bytes, offset: int = 0, as_array: bool = False
+) -> tuple[Dict | List | np.ndarray | None, int]:
+    """
+    解析单个BSON文档
+    全程在原始缓冲区上按绝对偏移读取，不为文档及子文档切片复制数据
+    as_array为True时按BSON数组解析：跳过"0"、"1"、...索引键，直接按顺序追加到列表；
+    元素全为double的数组直接返回float64数组
+    """
     if offset + 4 > len(data):
         return None, offset
     
     # 读取文档大小
-    doc_size = struct.unpack('<I', data[offset:offset+4])[0]
+    doc_size = _unpack_uint32(data, offset)[0]
     if offset + doc_size > len(data):
         return None, offset
     
-    doc_data = data[offset:offset+doc_size]
-    result = {}
+    doc_end = offset + doc_size
+    if as_array:
+        values = _parse_bson_double_array(data, offset, doc_end)
+        if values is not None:
+            return values, doc_end
     
-    pos = 4  # 跳过文档大小
+    find = data.find
+    result = [] if as_array else {}
+    append = result.append if as_array else None
+    field_name = None
     
-    while pos < len(doc_data) - 1:  # 最后一个字节是结束符0x00
-        if pos >= len(doc_data):
-            break
-            
+    pos = offset + 4  # 跳过文档大小
+    
+    while pos < doc_end - 1:  # 最后一个字节是结束符0x00
         # 读取字段类型
-        field_type = doc_data[pos]
+        field_type = data[pos]
         pos += 1
         
-        # 读取字段名
-        name_end = doc_data.find(b'\x00', pos)
+        # 读取字段名（数组元素的索引键无需解码）
+        name_end = find(b'\x00', pos, doc_end)
         if name_end == -1:
             break
-        field_name = doc_data[pos:name_end].decode('utf-8', errors='ignore')
+        if not as_array:
+            field_name = _decode_field_name(data[pos:name_end])
         pos = name_end + 1
         
-        # 根据类型解析值
+        # 根据类型解析值，越界的字段不写入结果
         if field_type == 0x01:  # double
-            if pos + 8 <= len(doc_data):
-                value = struct.unpack('<d', doc_data[pos:pos+8])[0]
-                pos += 8
-                result[field_name] = value
+            if pos + 8 > doc_end:
+                continue
+            value = _unpack_double(data, pos)[0]
+            pos += 8
         elif field_type == 0x02:  # string
-            if pos + 4 <= len(doc_data):
-                str_len = struct.unpack('<I', doc_data[pos:pos+4])[0]
-                pos += 4
-                if pos + str_len <= len(doc_data):
-                    value = doc_data[pos:pos+str_len-1].decode('utf-8', errors='ignore')
-                    pos += str_len
-                    result[field_name] = value
-        elif field_type == 0x03:  # document
-            if pos + 4 <= len(doc_data):
-                subdoc_size = struct.unpack('<I', doc_data[pos:pos+4])[0]
-                if pos + subdoc_size <= len(doc_data):
-                    subdoc, _ = parse_bson_document(doc_data, pos)
-                    if subdoc is not None:
-                        result[field_name] = subdoc
-                    pos += subdoc_size
-        elif field_type == 0x04:  # array
-            if pos + 4 <= len(doc_data):
-                array_size = struct.unpack('<I', doc_data[pos:pos+4])[0]
-                if pos + array_size <= len(doc_data):
-                    array_doc, _ = parse_bson_document(doc_data, pos)
-                    if array_doc is not None:
-                        # 将字典转换为列表（BSON数组以索引为键）
-                        array_list = []
-                        for i in range(len(array_doc)):
-                            if str(i) in array_doc:
-                                array_list.append(array_doc[str(i)])
-                        result[field_name] = array_list
-                    pos += array_size
+            if pos + 4 > doc_end:
+                continue
+            str_len = _unpack_uint32(data, pos)[0]
+            pos += 4
+            if pos + str_len > doc_end:
+                continue
+            value = data[pos:pos+str_len-1].decode('utf-8', errors='ignore')
+            pos += str_len
+        elif field_type == 0x03 or field_type == 0x04:  # document / array
+            if pos + 4 > doc_end:
+                continue
+            subdoc_size = _unpack_uint32(data, pos)[0]
+            if pos + subdoc_size > doc_end:
+                continue
+            value, _ = parse_bson_document(data, pos, field_type == 0x04)
+            pos += subdoc_size
+            if value is None:
+                continue
         elif field_type == 0x08:  # boolean
-            if pos + 1 <= len(doc_data):
-                value = doc_data[pos] != 0
-                pos += 1
-                result[field_name] = value
+            if pos + 1 > doc_end:
+                continue
+            value = data[pos] != 0
+            pos += 1
         elif field_type == 0x10:  # int32
-            if pos + 4 <= len(doc_data):
-                value = struct.unpack('<i', doc_data[pos:pos+4])[0]
-                pos += 4
-                result[field_name] = value
+            if pos + 4 > doc_end:
+                continue
+            value = _unpack_int32(data, pos)[0]
+            pos += 4
         elif field_type == 0x12:  # int64
-            if pos + 8 <= len(doc_data):
-                value = struct.unpack('<q', doc_data[pos:pos+8])[0]
-                pos += 8
-                result[field_name] = value
+            if pos + 8 > doc_end:
+                continue
+            value = _unpack_int64(data, pos)[0]
+            pos += 8
         else:
             # 未知类型，跳过
             break
+        
+        if as_array:
+            append(value)
+        else:
+            result[field_name] = value
     
     return result, offset + doc_size
 
 
+def map_bson_file(path: Path) -> bytes | mmap.mmap:
+    """
+    以只读内存映射打开BSON文件，解析时直接读取页缓存，不把整个文件复制进Python bytes
+    空文件无法映射，返回空bytes
+    """
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+def _iter_bson_fields(data: bytes, offset: int = 0) -> Iterator[tuple[int, int, int, int]]:
+    """
+    逐个扫描文档的顶层字段，产出(类型, 字段名起始偏移, 值偏移, 值长度)，不解析字段值
+    字段名位于[字段名起始偏移, 值偏移 - 1)；遇到截断或未知类型时停止
+    """
+    if offset + 4 > len(data):
+        return
+    doc_end = offset + _unpack_uint32(data, offset)[0]
+    if doc_end > len(data):
+        return
+    
+    find = data.find
+    pos = offset + 4
+    while pos < doc_end - 1:
+        field_type = data[pos]
+        name_start = pos + 1
+        name_end = find(b'\x00', name_start, doc_end)
+        if name_end == -1:
+            break
+        pos = name_end + 1
+        
+        size = _BSON_FIXED_SIZES.get(field_type)
+        if size is None:
+            if field_type in (0x02, 0x0D, 0x0E):  # string / JavaScript / symbol
+                size = 4 + _unpack_uint32(data, pos)[0]
+            elif field_type in (0x03, 0x04):  # document / array
+                size = _unpack_uint32(data, pos)[0]
+            elif field_type == 0x05:  # binary
+                size = 5 + _unpack_uint32(data, pos)[0]
+            else:
+                # 未知类型，无法确定长度
+                break
+        yield field_type, name_start, pos, size
+        pos += size
+
+
+def parse_bson_index(data: bytes, offset: int = 0) -> Dict[str, tuple[int, int, int]]:
+    """
+    只扫描文档的顶层字段，记录每个字段的(类型, 值偏移, 值长度)，不解析字段值
+    可据此按需解码个别字段，跳过不需要的子文档与数组
+    """
+    return {
+        _decode_field_name(data[name_start:pos - 1]): (field_type, pos, size)
+        for field_type, name_start, pos, size in _iter_bson_fields(data, offset)
+    }
+
+
+def count_bson_entries(data: bytes, offset: int = 0) -> int:
+    """
+    统计文档/数组的顶层元素个数，按各元素声明的长度跳过，不解码字段名与值
+    """
+    return sum(1 for _ in _iter_bson_fields(data, offset))
+
+
+def decode_bson_field(data: bytes, field: tuple[int, int, int]) -> Dict | List | np.ndarray:
+    """
+    解码parse_bson_index记录的单个子文档/数组字段，数组返回列表
+    """
+    field_type, pos, size = field
+    if field_type not in (0x03, 0x04):
+        raise ValueError(f"Unsupported BSON field type for lazy decoding: {field_type:#x}")
+    if HAS_BSON:
+        doc = _bson_decode(memoryview(data)[pos:pos + size])
+        # BSON数组以"0"、"1"、...为键依次存储
+        return list(doc.values()) if field_type == 0x04 else doc
+    doc, _ = parse_bson_document(data, pos, field_type == 0x04)
+    if doc is None:
+        raise ValueError("Truncated BSON document")
+    return doc
+
+
 class LerobotFormatConverterMmk2(LerobotFormatConverter):
     """MMK2机器人转换器 - JPG+BSON格式"""
     
@@ -133,8 +332,22 @@ class LerobotFormatConverterMmk2(LerobotFormatConverter):
         video_backend: str = "pyav",
         image_writer_processes: int = 4,
         image_writer_threads: int = 4,
+        image_prefetch_window: int = 8,
     ) -> None:
         self.mmk2_buffer: Mmk2Buffer = Mmk2Buffer()
+        # 图像预读线程池：每个相机提前解码接下来image_prefetch_window帧，0表示关闭预读
+        # JPEG解码时释放GIL，解码可以与下游处理重叠
+        self._image_prefetch_window = max(0, image_prefetch_window)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, image_writer_threads))
+        # task_path -> 排序后的episode目录列表，每个任务目录只扫描一次
+        self._task_episode_dirs: Dict[Path, List[Path]] = {}
+        # 配置中引用的主BSON数据路径，加载时只解码这些路径，其余话题直接跳过
+        self._main_data_paths = self._collect_data_paths(converter_config, MAIN_BSON_FILE)
+        # 配置中引用的手部数据路径及其拆分结果，加载时按路径展平每帧数据
+        hand_data_paths = self._collect_data_paths(converter_config, HAND_BSON_FILE) or ()
+        self._hand_data_paths = {data_path: tuple(data_path.split('.')) for data_path in hand_data_paths}
+        # 配置中引用的相机目录，每个episode只扫描这些目录
+        self._camera_dirs = self._collect_camera_dirs(converter_config)
         super().__init__(
             dataset_path=dataset_path,
             output_path=output_path,
@@ -156,6 +369,8 @@ class LerobotFormatConverterMmk2(LerobotFormatConverter):
         args_dict: dict,
         images_buffer: any = None,
     ) -> np.ndarray:
+        # 只有转换过程中复用的episode缓存才值得预读；临时构建的缓存（如初始化时读取样本帧）直接同步解码
+        use_prefetch = bool(images_buffer)
         if not images_buffer:
             images_buffer = self._prepare_episode_images_buffer(task_path, ep_idx)
 
@@ -173,13 +388,17 @@ class LerobotFormatConverterMmk2(LerobotFormatConverter):
             raise ValueError(f"Frame index {frame_idx} out of range for camera {camera_dir}. Available frames: {len(camera_files)}")
         
         image_path = camera_files[frame_idx]
+        prefetcher = images_buffer.get("prefetchers", {}).get(camera_dir) if use_prefetch else None
         
-        if not image_path.exists():
-            raise ValueError(f"Image file not found: {image_path}")
-        
-        # 读取并返回图像
-        img = Image.open(image_path)
-        return np.array(img)
+        # 文件列表来自准备缓存时的目录扫描，无需再stat一次；文件被删除等情况由打开失败兜底
+        # 只把文件缺失报告为找不到文件，图像损坏等解码错误按原异常抛出
+        try:
+            if prefetcher is None:
+                return decode_image_file(image_path)
+            upcoming_paths = camera_files[frame_idx + 1:frame_idx + 1 + prefetcher.window]
+            return prefetcher.get(image_path, upcoming_paths)
+        except FileNotFoundError as e:
+            raise ValueError(f"Image file not found: {image_path}") from e
 
     # @override
     def _get_frame_sub_states(
@@ -199,7 +418,7 @@ class LerobotFormatConverterMmk2(LerobotFormatConverter):
         range_to = args_dict["range_to"]
         
         # 根据不同的BSON文件处理数据
-        if bson_file == "episode_0(8).bson":
+        if bson_file == MAIN_BSON_FILE:
             # 主要关节数据
             field = args_dict.get("field", "pos")  # 默认使用pos字段
             
@@ -211,33 +430,36 @@ class LerobotFormatConverterMmk2(LerobotFormatConverter):
             if frame_idx >= len(data_list):
                 raise ValueError(f"Frame index {frame_idx} out of range. Available: {len(data_list)}")
             
+            # 优先从按帧堆叠的数组中直接取行切片
+            main_columns = sub_states_buffer["main_columns"]
+            column_key = (data_path, field)
+            if column_key not in main_columns:
+                main_columns[column_key] = self._stack_main_column(data_list, field)
+            column = main_columns[column_key]
+            if column is not None:
+                return column[frame_idx, range_from:range_to]
+            
             frame_data = data_list[frame_idx]
             if "data" not in frame_data or field not in frame_data["data"]:
                 raise ValueError(f"Field '{field}' not found in frame data")
             
             values = frame_data["data"][field]
-            return np.array(values[range_from:range_to])
+            return np.asarray(values[range_from:range_to], dtype=np.float32)
             
-        elif bson_file == "xhand_control_data(7).bson":
+        elif bson_file == HAND_BSON_FILE:
             # 手部数据
             hand_data = sub_states_buffer["hand_data"]
             
             if frame_idx >= len(hand_data):
                 raise ValueError(f"Frame index {frame_idx} out of range for hand data. Available: {len(hand_data)}")
             
-            frame_data = hand_data[frame_idx]
+            # 手部数据已在加载时按data_path展平，例如: "observation.left_hand"
+            data = hand_data[frame_idx].get(data_path)
+            if data is None:
+                raise ValueError(f"Path '{data_path}' not found in hand data")
             
-            # 解析data_path，例如: "observation.left_hand"
-            path_parts = data_path.split('.')
-            data = frame_data
-            for part in path_parts:
-                if part in data:
-                    data = data[part]
-                else:
-                    raise ValueError(f"Path '{data_path}' not found in hand data")
-            
-            if isinstance(data, list):
-                return np.array(data[range_from:range_to])
+            if isinstance(data, (list, np.ndarray)):
+                return np.asarray(data[range_from:range_to], dtype=np.float32)
             else:
                 raise ValueError(f"Expected list data for path '{data_path}', got {type(data)}")
         
@@ -263,84 +485,251 @@ class LerobotFormatConverterMmk2(LerobotFormatConverter):
     def _get_episode_frames_num(self, task_path: Path, ep_idx: int) -> int:
         """获取episode的帧数 - 使用主BSON文件的帧数"""
         episode_dir = self._get_episode_directory(task_path, ep_idx)
-        main_bson_file = episode_dir / "episode_0(8).bson"
+        main_bson_file = episode_dir / MAIN_BSON_FILE
         
         if not main_bson_file.exists():
             raise ValueError(f"Main BSON file not found: {main_bson_file}")
         
         try:
-            with open(main_bson_file, 'rb') as f:
-                content = f.read()
-            
-            doc, _ = parse_bson_document(content, 0)
-            if doc and "data" in doc:
-                # 获取任一数据路径的长度作为帧数
-                for key, value in doc["data"].items():
-                    if isinstance(value, list):
-                        return len(value)
+            main_data_index = self._get_main_data_index(task_path, ep_idx)
+            # 获取任一数据路径的长度作为帧数，只统计数组元素个数，不解码元素
+            for field_type, pos, _ in main_data_index.values():
+                if field_type == 0x04:
+                    return count_bson_entries(self.mmk2_buffer.main_bson_raw, pos)
             
             return 0
-        except Exception as e:
-            raise ValueError(f"Error reading main BSON file: {e}")
+        except (OSError, struct.error) as e:
+            # 文件读取/映射失败，或文档被截断导致定长字段越界
+            raise ValueError(f"Error reading main BSON file: {e}") from e
 
     # @override
     def _get_task_episodes_num(self, task_path: Path) -> int:
         """获取任务的episode数量"""
-        episode_dirs = [d for d in task_path.iterdir() if d.is_dir() and d.name.startswith("episode")]
-        return len(episode_dirs)
+        return len(self._get_task_episode_directories(task_path))
 
     # @override
     def _prepare_episode_images_buffer(self, task_path: Path, ep_idx: int) -> any:
         """准备图像缓冲区"""
-        episode_dir = self._get_episode_directory(task_path, ep_idx)
-        
-        camera_groups = {}
-        for camera_dir in ["camera_0", "camera_1", "camera_2"]:
-            camera_path = episode_dir / camera_dir
-            if camera_path.exists():
-                jpg_files = natsorted(list(camera_path.glob("*.jpg")))
-                camera_groups[camera_dir] = jpg_files
+        buffer = self._get_episode_buffer(task_path, ep_idx)
+        if buffer.camera_groups is None:
+            episode_dir = self._get_episode_directory(task_path, ep_idx)
+            
+            camera_groups = {}
+            for camera_dir in self._camera_dirs:
+                camera_path = episode_dir / camera_dir
+                if camera_path.exists():
+                    camera_groups[camera_dir] = self._list_jpg_files(camera_path)
+            buffer.camera_groups = camera_groups
+            if self._image_prefetch_window:
+                buffer.prefetchers = {
+                    camera_dir: FramePrefetcher(
+                        self._image_pool, decode_image_file, self._image_prefetch_window
+                    )
+                    for camera_dir in camera_groups
+                }
         
-        return {"camera_groups": camera_groups}
+        return {"camera_groups": buffer.camera_groups, "prefetchers": buffer.prefetchers}
 
     # @override
     def _prepare_episode_states_buffer(self, task_path: Path, ep_idx: int) -> any:
-        """准备状态数据缓冲区"""
-        episode_dir = self._get_episode_directory(task_path, ep_idx)
+        """准备状态数据缓冲区，同一episode的BSON文件只读取并解析一次"""
+        buffer = self._get_episode_buffer(task_path, ep_idx)
+        episode_dir = None
         
-        # 读取主BSON文件
-        main_bson_file = episode_dir / "episode_0(8).bson"
-        main_data = {}
-        if main_bson_file.exists():
-            with open(main_bson_file, 'rb') as f:
-                content = f.read()
-            doc, _ = parse_bson_document(content, 0)
-            if doc and "data" in doc:
-                main_data = doc["data"]
+        # 解码主BSON文件中配置引用的数据路径
+        if buffer.main_bson_data is None:
+            # 首次加载本episode时通知内核预读下一个episode的BSON文件，读盘与本episode的处理重叠
+            self._readahead_episode_bson_files(task_path, ep_idx + 1)
+            main_data_index = self._get_main_data_index(task_path, ep_idx)
+            main_data = {}
+            for data_path, field in main_data_index.items():
+                if field[0] == 0x03 or field[0] == 0x04:
+                    if self._main_data_paths is None or data_path in self._main_data_paths:
+                        main_data[data_path] = decode_bson_field(buffer.main_bson_raw, field)
+            buffer.main_bson_data = main_data
         
         # 读取手部BSON文件
-        hand_bson_file = episode_dir / "xhand_control_data(7).bson"
-        hand_data = []
-        if hand_bson_file.exists():
-            with open(hand_bson_file, 'rb') as f:
-                content = f.read()
-            doc, _ = parse_bson_document(content, 0)
-            if doc and "frames" in doc:
-                hand_data = doc["frames"]
+        if buffer.hand_bson_data is None:
+            if episode_dir is None:
+                episode_dir = self._get_episode_directory(task_path, ep_idx)
+            hand_bson_file = episode_dir / HAND_BSON_FILE
+            hand_data = []
+            if hand_bson_file.exists():
+                content = map_bson_file(hand_bson_file)
+                try:
+                    # 只解码frames字段
+                    frames_field = parse_bson_index(content).get("frames")
+                    if frames_field is not None and frames_field[0] in (0x03, 0x04):
+                        hand_data = decode_bson_field(content, frames_field)
+                finally:
+                    if isinstance(content, mmap.mmap):
+                        content.close()
+            if isinstance(hand_data, list):
+                hand_data = [self._flatten_hand_frame(frame) for frame in hand_data]
+            buffer.hand_bson_data = hand_data
         
         return {
-            "main_data": main_data,
-            "hand_data": hand_data
+            "main_data": buffer.main_bson_data,
+            "main_columns": buffer.main_columns,
+            "hand_data": buffer.hand_bson_data
         }
 
     # @override
     def _prepare_episode_actions_buffer(self, task_path: Path, ep_idx: int) -> any:
-        """准备动作数据缓冲区 - 与状态数据共用"""
+        """准备动作数据缓冲区 - 与状态数据共用（直接复用已缓存的解析结果）"""
         return self._prepare_episode_states_buffer(task_path, ep_idx)
 
+    def close(self) -> None:
+        """释放当前episode的缓冲区，并关闭图像预读线程池"""
+        self.mmk2_buffer.close()
+        self.mmk2_buffer = Mmk2Buffer()
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+
+    # @override
+    def convert(self) -> Iterable[tuple[str, int, int]]:
+        try:
+            yield from super().convert()
+        finally:
+            self.close()
+
+    def _get_episode_buffer(self, task_path: Path, ep_idx: int) -> Mmk2Buffer:
+        """返回当前episode的缓冲区，episode切换时丢弃上一个episode的数据"""
+        if self.mmk2_buffer.task_path != task_path or self.mmk2_buffer.ep_idx != ep_idx:
+            self.mmk2_buffer.close()
+            self.mmk2_buffer = Mmk2Buffer(task_path=task_path, ep_idx=ep_idx)
+        return self.mmk2_buffer
+
+    def _get_main_data_index(self, task_path: Path, ep_idx: int) -> Dict[str, tuple[int, int, int]]:
+        """
+        读取主BSON文件并索引其data字段下的各数据路径，每个episode只读取一次
+        原始内容保存在缓冲区中，供按需解码各数据路径
+        """
+        buffer = self._get_episode_buffer(task_path, ep_idx)
+        if buffer.main_data_index is None:
+            # 首次访问本episode时同时对主BSON与手部BSON发起异步预读，两个文件的读盘并发进行
+            self._readahead_episode_bson_files(task_path, ep_idx)
+            main_bson_file = self._get_episode_directory(task_path, ep_idx) / MAIN_BSON_FILE
+            content = b""
+            main_data_index = {}
+            if main_bson_file.exists():
+                content = map_bson_file(main_bson_file)
+                data_field = parse_bson_index(content).get("data")
+                if data_field is not None and data_field[0] == 0x03:
+                    main_data_index = parse_bson_index(content, data_field[1])
+            buffer.main_bson_raw = content
+            buffer.main_data_index = main_data_index
+        return buffer.main_data_index
+
+    def _readahead_episode_bson_files(self, task_path: Path, ep_idx: int) -> None:
+        """通知内核异步预读指定episode的BSON文件，episode不存在时跳过"""
+        episode_dirs = self._get_task_episode_directories(task_path)
+        if ep_idx < len(episode_dirs):
+            episode_dir = episode_dirs[ep_idx]
+            readahead_files((episode_dir / MAIN_BSON_FILE, episode_dir / HAND_BSON_FILE))
+
+    @staticmethod
+    def _stack_main_column(data_list: List[Dict], field: str) -> np.ndarray | None:
+        """
+        将主BSON数据路径下各帧的同一字段堆叠为(帧数, 维度)的float32数组，每个episode只做一次
+        有帧缺少该字段或各帧长度不一致时返回None，取帧时逐帧读取
+        """
+        try:
+            column = np.asarray([frame_data["data"][field] for frame_data in data_list], dtype=np.float32)
+        except (KeyError, TypeError, ValueError):
+            return None
+        return column if column.ndim == 2 else None
+
+    def _flatten_hand_frame(self, frame: Dict | List | np.ndarray) -> Dict[str, Any]:
+        """
+        按配置引用的data_path展平一帧手部数据，取帧时只需一次字典查找
+        帧中不存在的路径不写入结果
+        """
+        flat_frame = {}
+        for data_path, path_parts in self._hand_data_paths.items():
+            data = frame
+            for part in path_parts:
+                if not isinstance(data, dict) or part not in data:
+                    break
+                data = data[part]
+            else:
+                flat_frame[data_path] = data
+        return flat_frame
+
+    @staticmethod
+    def _collect_data_paths(converter_config: dict, bson_file: str) -> frozenset[str] | None:
+        """
+        收集状态/动作配置中引用指定BSON文件的数据路径
+        配置不完整时返回None，表示解码全部数据路径
+        """
+        features = converter_config.get(FEATURES_KEY, {})
+        sub_configs = [
+            *features.get(OBSERVATION_KEY, {}).get(STATE_KEY, {}).get(SUB_STATE_KEY, []),
+            *features.get(ACTION_KEY, {}).get(SUB_ACTION_KEY, []),
+        ]
+        data_paths = set()
+        for sub_config in sub_configs:
+            args_dict = sub_config.get(ARGS_KEY, {})
+            if args_dict.get("bson_file") != bson_file:
+                continue
+            if "data_path" not in args_dict:
+                return None
+            data_paths.add(args_dict["data_path"])
+        return frozenset(data_paths)
+
+    @staticmethod
+    def _collect_camera_dirs(converter_config: dict) -> tuple[str, ...]:
+        """
+        收集图像配置中引用的相机目录（保持配置顺序、去重）
+        有图像配置缺少camera_dir时返回默认相机目录
+        """
+        image_configs = converter_config.get(FEATURES_KEY, {}).get(OBSERVATION_KEY, {}).get(IMAGE_KEY, [])
+        camera_dirs = []
+        for image_config in image_configs:
+            camera_dir = image_config.get(ARGS_KEY, {}).get("camera_dir")
+            if camera_dir is None:
+                return DEFAULT_CAMERA_DIRS
+            if camera_dir not in camera_dirs:
+                camera_dirs.append(camera_dir)
+        return tuple(camera_dirs) if camera_dirs else DEFAULT_CAMERA_DIRS
+
     def _get_episode_directory(self, task_path: Path, ep_idx: int) -> Path:
         """获取episode目录"""
-        episode_dirs = sorted([d for d in task_path.iterdir() if d.is_dir() and d.name.startswith("episode")])
+        episode_dirs = self._get_task_episode_directories(task_path)
         if ep_idx >= len(episode_dirs):
             raise ValueError(f"Episode index {ep_idx} out of range. Available: {len(episode_dirs)}")
-        return episode_dirs[ep_idx]
\ No newline at end of file
+        return episode_dirs[ep_idx]
+
+    def _get_task_episode_directories(self, task_path: Path) -> List[Path]:
+        """返回任务目录下排序后的episode目录，结果按任务缓存"""
+        episode_dirs = self._task_episode_dirs.get(task_path)
+        if episode_dirs is None:
+            episode_dirs = sorted(self._list_episode_directories(task_path))
+            self._task_episode_dirs[task_path] = episode_dirs
+        return episode_dirs
+
+    @staticmethod
+    def _list_episode_directories(task_path: Path) -> List[Path]:
+        """
+        列出任务目录下的episode目录
+        os.scandir返回的DirEntry自带文件类型，判断目录时无需再逐个stat
+        """
+        with os.scandir(task_path) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.name.startswith("episode") and entry.is_dir()
+            ]
+
+    @staticmethod
+    def _list_jpg_files(camera_path: Path) -> List[Path]:
+        """
+        列出相机目录下的jpg文件（与Path.glob("*.jpg")一致），按帧序号自然排序
+        文件名均为纯数字（如000123.jpg）时直接按整数排序，否则回退到natsorted
+        """
+        with os.scandir(camera_path) as entries:
+            names = [entry.name for entry in entries if entry.name.endswith(".jpg")]
+        stems = [name[:-4] for name in names]
+        if all(stem.isdigit() for stem in stems):
+            order = sorted(zip(map(int, stems), names))
+            return [camera_path / name for _, name in order]
+        return natsorted(camera_path / name for name in names)
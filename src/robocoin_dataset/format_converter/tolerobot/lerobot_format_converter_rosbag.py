@@ -1,14 +1,14 @@
-import io
 import json
 import logging
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, List
 
 import numpy as np
 from natsort import natsorted
-from PIL import Image
 from rosbags.highlevel import AnyReader
 from rosbags.typesys import get_types_from_msg, register_types
 
@@ -27,6 +27,25 @@ from robocoin_dataset.format_converter.tolerobot.time_alignment import (
     create_time_aligner,
     TimeSyncAnalyzer
 )
+from robocoin_dataset.format_converter.utils.image_decoder import (
+    decode_image_bytes,
+    readahead_files,
+)
+
+# 已知消息类型 -> 转换方法名，每个topic按连接声明的类型查表一次；未收录的类型按消息字段探测
+_MSGTYPE_CONVERTERS = {
+    "sensor_msgs/msg/Image": "_convert_ros_image",
+    "sensor_msgs/msg/CompressedImage": "_convert_compressed_image",
+    "sensor_msgs/msg/JointState": "_joint_state_row",
+    "sensor_msgs/msg/Imu": "_imu_row",
+    "geometry_msgs/msg/TwistStamped": "_twist_row",
+    "geometry_msgs/msg/PoseStamped": "_convert_geometry_msg",
+    "geometry_msgs/msg/PoseWithCovarianceStamped": "_convert_geometry_msg",
+}
+# 数值类消息每条转换为一行，整个topic堆叠为一个(帧数, 维度)数组
+_ROW_CONVERTERS = frozenset(
+    {"_joint_state_row", "_imu_row", "_twist_row", "_multi_array_row", "_convert_geometry_msg"}
+)
 
 
 @dataclass
@@ -51,6 +70,8 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
         alignment_config: AlignmentConfig | None = None,
     ) -> None:
         self.rosbag_buffer: RosbagBuffer = RosbagBuffer()
+        # 压缩图像解码线程池：JPEG/PNG解码时释放GIL，同一topic的各帧可并行解码
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, image_writer_threads))
         
         # 配置时间对齐策略
         if alignment_config is None:
@@ -161,9 +182,9 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
         if not rosbag_data:
             return 0
             
-        # 获取任意一个topic的长度作为帧数
+        # 获取任意一个topic的长度作为帧数（数值topic为二维数组，不能直接做真值判断）
         first_topic_data = next(iter(rosbag_data.values()))
-        frame_count = len(first_topic_data) if first_topic_data else 0
+        frame_count = len(first_topic_data)
         
         if self.logger:
             self.logger.info(f"Episode {ep_idx} 帧数: {frame_count}")
@@ -186,6 +207,18 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
     def _prepare_episode_actions_buffer(self, task_path: Path, ep_idx: int) -> any:
         return self._get_episode_rosbag_data(task_path, ep_idx)
 
+    def close(self) -> None:
+        """释放当前episode的缓冲区，并关闭图像解码线程池"""
+        self.rosbag_buffer = RosbagBuffer()
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+
+    # @override
+    def convert(self) -> Iterable[tuple[str, int, int]]:
+        try:
+            yield from super().convert()
+        finally:
+            self.close()
+
     @cached_property
     def task_episode_rosbagfile_paths(self) -> dict[Path, list[Path]]:
         task_episode_paths = {}
@@ -234,8 +267,9 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
         
         rosbag_file_path = self.task_episode_rosbagfile_paths[task_path][ep_idx]
         
-        # 第1步：读取rosbag文件并按topic组织原始消息
-        topic_messages = self._read_raw_topic_messages(rosbag_file_path)
+        # 第1步：读取rosbag文件并按topic组织原始消息，同时记录各topic的消息类型
+        topic_msgtypes = {}
+        topic_messages = self._read_raw_topic_messages(rosbag_file_path, topic_msgtypes)
         
         # 第2步：分析时间同步质量（可选）
         if self.logger:
@@ -250,7 +284,9 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
         processed_data = {}
         for topic_name, messages in aligned_messages.items():
             if messages:
-                processed_data[topic_name] = self._process_aligned_messages(messages, topic_name)
+                processed_data[topic_name] = self._process_aligned_messages(
+                    messages, topic_name, topic_msgtypes.get(topic_name)
+                )
         
         # 缓存结果
         self.rosbag_buffer.rosbag_data = processed_data
@@ -261,15 +297,21 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
         print(f"Topics: {list(processed_data.keys())}")
         return processed_data
     
-    def _read_raw_topic_messages(self, rosbag_file_path: Path) -> Dict[str, List[Dict]]:
-        """读取rosbag文件的原始消息，按topic组织"""
+    def _read_raw_topic_messages(
+        self, rosbag_file_path: Path, topic_msgtypes: Dict[str, str] | None = None
+    ) -> Dict[str, List[Dict]]:
+        """读取rosbag文件的原始消息，按topic组织；传入topic_msgtypes时记录各topic的消息类型"""
         topic_messages = {}
         
+        # 打开前通知内核异步预读整个bag文件，AnyReader随后逐块pread时直接命中页缓存
+        readahead_files((rosbag_file_path,))
         with AnyReader([rosbag_file_path]) as reader:
             for connection, timestamp, rawdata in reader.messages():
                 topic_name = connection.topic
                 if topic_name not in topic_messages:
                     topic_messages[topic_name] = []
+                    if topic_msgtypes is not None:
+                        topic_msgtypes[topic_name] = connection.msgtype
                 
                 # 解序列化消息
                 msg = reader.deserialize(rawdata, connection.msgtype)
@@ -280,59 +322,117 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
         
         return topic_messages
     
-    def _process_aligned_messages(self, messages: List[Any], topic_name: str) -> List[Any]:
-        """处理已对齐的消息列表，转换为最终格式"""
+    def _process_aligned_messages(
+        self, messages: List[Any], topic_name: str, msgtype: str | None = None
+    ) -> List[Any] | np.ndarray:
+        """
+        处理已对齐的消息列表，转换为最终格式
+        图像topic返回逐帧数组的列表，数值topic返回(帧数, 维度)数组
+        """
         if not messages:
             return []
         
-        first_msg = messages[0]
+        # 每个topic只选择一次转换函数，逐条消息直接调用
+        converter_name = self._get_msg_converter_name(messages[0], msgtype)
+        if converter_name is not None:
+            convert = getattr(self, converter_name)
+            if converter_name in _ROW_CONVERTERS:
+                return self._stack_rows(messages, convert)
+            if converter_name == "_convert_compressed_image":
+                # 压缩图像逐帧解码是主要耗时，分发到线程池并行解码，结果保持消息顺序
+                return list(self._image_pool.map(convert, messages))
+            return [convert(msg) for msg in messages]
+        
+        # 默认处理：尝试转换为numpy数组
+        try:
+            return [self._msg_to_array(msg) for msg in messages]
+        except:
+            # 如果无法转换，返回原始消息
+            return messages
+    
+    @staticmethod
+    def _get_msg_converter_name(first_msg: object, msgtype: str | None = None) -> str | None:
+        """
+        选择topic的消息转换方法名：已知消息类型直接查表，否则按第一条消息的字段探测
+        返回None表示按默认方式处理
+        """
+        converter_name = _MSGTYPE_CONVERTERS.get(msgtype)
+        if converter_name is not None:
+            return converter_name
         
         # 处理图像消息 - sensor_msgs/Image
         if hasattr(first_msg, 'data') and hasattr(first_msg, 'height') and hasattr(first_msg, 'width'):
-            return [self._convert_ros_image(msg) for msg in messages]
+            return "_convert_ros_image"
         
         # 处理压缩图像消息 - sensor_msgs/CompressedImage
         elif hasattr(first_msg, 'data') and hasattr(first_msg, 'format'):
-            return [self._convert_compressed_image(msg) for msg in messages]
+            return "_convert_compressed_image"
             
         # 处理关节状态消息 - sensor_msgs/JointState
         elif hasattr(first_msg, 'name') and hasattr(first_msg, 'position'):
-            return [np.array(msg.position) for msg in messages]
+            return "_joint_state_row"
             
         # 处理IMU消息 - sensor_msgs/Imu
         elif hasattr(first_msg, 'linear_acceleration') and hasattr(first_msg, 'angular_velocity'):
-            imu_data = []
-            for msg in messages:
-                linear_acc = [msg.linear_acceleration.x, msg.linear_acceleration.y, msg.linear_acceleration.z]
-                angular_vel = [msg.angular_velocity.x, msg.angular_velocity.y, msg.angular_velocity.z]
-                imu_data.append(np.array(linear_acc + angular_vel))
-            return imu_data
+            return "_imu_row"
             
         # 处理Twist消息 - geometry_msgs/TwistStamped
         elif hasattr(first_msg, 'twist') and hasattr(first_msg.twist, 'linear'):
-            twist_data = []
-            for msg in messages:
-                twist_msg = msg.twist if hasattr(msg, 'twist') else msg
-                linear = [twist_msg.linear.x, twist_msg.linear.y, twist_msg.linear.z]
-                angular = [twist_msg.angular.x, twist_msg.angular.y, twist_msg.angular.z]
-                twist_data.append(np.array(linear + angular))
-            return twist_data
+            return "_twist_row"
             
         # 处理数值数组消息 - std_msgs/Float64MultiArray等
         elif hasattr(first_msg, 'data') and isinstance(first_msg.data, (list, tuple)):
-            return [np.array(msg.data) for msg in messages]
+            return "_multi_array_row"
             
         # 处理几何消息 - geometry_msgs类型
         elif hasattr(first_msg, 'pose') or hasattr(first_msg, 'position'):
-            return [self._convert_geometry_msg(msg) for msg in messages]
-            
-        # 默认处理：尝试转换为numpy数组
-        else:
-            try:
-                return [self._msg_to_array(msg) for msg in messages]
-            except:
-                # 如果无法转换，返回原始消息
-                return messages
+            return "_convert_geometry_msg"
+        
+        return None
+    
+    @staticmethod
+    def _stack_rows(messages: List[Any], to_row: Callable[[Any], Sequence[float]]) -> List[np.ndarray] | np.ndarray:
+        """
+        将数值消息逐行写入预分配的(帧数, 维度)数组，不为每帧单独创建数组
+        各帧维度不一致时回退为逐帧数组的列表
+        """
+        first_row = to_row(messages[0])
+        dim = len(first_row)
+        rows = np.empty((len(messages), dim), dtype=np.float64)
+        try:
+            rows[0] = first_row
+            for row_idx in range(1, len(messages)):
+                row = to_row(messages[row_idx])
+                # 先检查长度：长度为1的行写入时会被广播到整行，不会报错
+                if len(row) != dim:
+                    break
+                rows[row_idx] = row
+            else:
+                return rows
+        except (TypeError, ValueError):
+            pass
+        return [np.array(to_row(msg)) for msg in messages]
+    
+    def _joint_state_row(self, joint_msg: object) -> Sequence[float]:
+        """关节状态消息的一行数据（关节位置）"""
+        return joint_msg.position
+    
+    def _imu_row(self, imu_msg: object) -> Sequence[float]:
+        """IMU消息的一行数据：线加速度 + 角速度"""
+        linear_acc = imu_msg.linear_acceleration
+        angular_vel = imu_msg.angular_velocity
+        return (linear_acc.x, linear_acc.y, linear_acc.z, angular_vel.x, angular_vel.y, angular_vel.z)
+    
+    def _twist_row(self, twist_stamped_msg: object) -> Sequence[float]:
+        """Twist消息的一行数据：线速度 + 角速度"""
+        twist_msg = twist_stamped_msg.twist if hasattr(twist_stamped_msg, 'twist') else twist_stamped_msg
+        linear = twist_msg.linear
+        angular = twist_msg.angular
+        return (linear.x, linear.y, linear.z, angular.x, angular.y, angular.z)
+    
+    def _multi_array_row(self, array_msg: object) -> Sequence[float]:
+        """数值数组消息的一行数据"""
+        return array_msg.data
     
     def _convert_ros_image(self, img_msg) -> np.ndarray:
         """转换ROS图像消息为numpy数组"""
@@ -344,7 +444,8 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
             return image_data.reshape((img_msg.height, img_msg.width, 3))
         elif img_msg.encoding == 'bgr8':
             image_array = image_data.reshape((img_msg.height, img_msg.width, 3))
-            return image_array[:, :, [2, 1, 0]]  # BGR to RGB
+            # BGR to RGB：反转通道的视图再整体拷贝为连续数组，避免整数索引的逐元素gather
+            return np.ascontiguousarray(image_array[:, :, ::-1])
         elif img_msg.encoding == 'mono8':
             return image_data.reshape((img_msg.height, img_msg.width))
         else:
@@ -352,9 +453,11 @@ class LerobotFormatConverterRosbag(LerobotFormatConverter):
             return image_data.reshape((img_msg.height, img_msg.width, -1))
     
     def _convert_compressed_image(self, comp_img_msg) -> np.ndarray:
-        """转换ROS压缩图像消息为numpy数组"""  
-        image = Image.open(io.BytesIO(comp_img_msg.data))
-        return np.array(image)
+        """
+        转换ROS压缩图像消息为numpy数组
+        JPEG优先使用libjpeg-turbo解码（释放GIL），PNG/WebP使用imagecodecs，其余格式回退到PIL
+        """
+        return decode_image_bytes(comp_img_msg.data)
         
     def _convert_geometry_msg(self, geom_msg) -> np.ndarray:
         """转换几何消息为numpy数组"""
@@ -0,0 +1,59 @@
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Executor, Future
+
+import numpy as np
+
+
+class FramePrefetcher:
+    """
+    在线程池中提前读取并解码接下来若干帧的图像，使磁盘IO/解码与下游处理重叠
+    同一帧可能被连续访问多次（生成帧数据与组装lerobot数据各一次），
+    因此取用时不移除结果，只在请求新的帧时丢弃不再需要的结果
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        decode_fn: Callable[[Hashable], np.ndarray],
+        window: int = 8,
+    ) -> None:
+        self._executor = executor
+        self._decode_fn = decode_fn
+        self._window = max(0, window)
+        self._futures: dict[Hashable, Future] = {}
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    def get(self, key: Hashable, upcoming_keys: Iterable[Hashable] = ()) -> np.ndarray:
+        """
+        返回key对应的解码结果，并为upcoming_keys中的后续帧提交预读任务
+        key不在预读窗口内时（如随机访问）退化为同步解码
+        """
+        keep = {key}
+        for upcoming_key in upcoming_keys:
+            if len(keep) > self._window:
+                break
+            keep.add(upcoming_key)
+
+        for stale_key in [k for k in self._futures if k not in keep]:
+            self._futures.pop(stale_key).cancel()
+
+        for upcoming_key in keep:
+            if upcoming_key != key and upcoming_key not in self._futures:
+                self._futures[upcoming_key] = self._executor.submit(self._decode_fn, upcoming_key)
+
+        future = self._futures.get(key)
+        if future is None:
+            result = self._decode_fn(key)
+            future = Future()
+            future.set_result(result)
+            self._futures[key] = future
+            return result
+        return future.result()
+
+    def clear(self) -> None:
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
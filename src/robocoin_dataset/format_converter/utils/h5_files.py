@@ -0,0 +1,36 @@
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from natsort import natsort_keygen
+
+H5_SUFFIXES = (".h5", ".hdf5")
+
+# Natural-sort key, built once instead of on every natsorted() call. The default
+# algorithm keeps the episode order identical to the previous natsorted() results.
+_NATKEY = natsort_keygen()
+
+
+def iter_h5_files(root: Path) -> Iterator[Path]:
+    """
+    Walk the directory tree once and yield every .h5/.hdf5 file.
+    """
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            if file_name.endswith(H5_SUFFIXES):
+                yield Path(dir_path) / file_name
+
+
+def _h5_order_key(path: Path) -> tuple[bool, tuple]:
+    """
+    Sort key matching the previous per-suffix listing: every .h5 file in natural
+    order first, then every .hdf5 file, so mixed datasets keep their episode numbering.
+    """
+    return path.suffix == ".hdf5", _NATKEY(path)
+
+
+def find_h5_files(root: Path) -> list[Path]:
+    """
+    Find every .h5/.hdf5 file under root in a single walk, ordered by _h5_order_key.
+    """
+    return sorted(iter_h5_files(root), key=_h5_order_key)
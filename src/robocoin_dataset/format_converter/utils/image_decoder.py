@@ -0,0 +1,137 @@
+import io
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+try:
+    from turbojpeg import TJCS_GRAY, TJPF_GRAY, TJPF_RGB, TurboJPEG
+
+    _turbo_jpeg = TurboJPEG()
+    HAS_TURBOJPEG = True
+except (ImportError, RuntimeError, OSError):
+    # PyTurboJPEG未安装，或找不到libjpeg-turbo动态库
+    HAS_TURBOJPEG = False
+
+try:
+    import cv2
+
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+try:
+    import imagecodecs
+
+    HAS_IMAGECODECS = True
+except ImportError:
+    HAS_IMAGECODECS = False
+
+JPEG_SUFFIXES = frozenset({".jpg", ".jpeg"})
+# JPEG SOI标记 + 第一个段标记的起始字节
+JPEG_MAGIC = b"\xff\xd8\xff"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+# WebP为RIFF容器：b"RIFF" + 4字节长度 + b"WEBP"
+RIFF_MAGIC = b"RIFF"
+WEBP_MAGIC = b"WEBP"
+
+# posix_fadvise仅在Linux等POSIX平台可用
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+
+def pil_to_ndarray(img: Image.Image) -> np.ndarray:
+    """
+    将PIL图像转换为numpy数组
+    先load()完成解码，再用np.asarray直接使用PIL导出的缓冲区，避免np.array的二次拷贝
+    """
+    img.load()
+    return np.asarray(img)
+
+
+def decode_jpeg_bytes(data: bytes | np.ndarray) -> np.ndarray:
+    """
+    使用libjpeg-turbo解码JPEG数据
+    输出与PIL保持一致：灰度图为(H, W)，彩色图为(H, W, 3) RGB
+    """
+    _, _, _, colorspace = _turbo_jpeg.decode_header(data)
+    if colorspace == TJCS_GRAY:
+        return _turbo_jpeg.decode(data, pixel_format=TJPF_GRAY)[..., 0]
+    return _turbo_jpeg.decode(data, pixel_format=TJPF_RGB)
+
+
+def decode_jpeg_cv2(data: bytes | np.ndarray) -> np.ndarray:
+    """
+    使用OpenCV解码JPEG数据，直接解码到numpy数组，不经过PIL的中间缓冲区
+    输出与PIL保持一致：灰度图为(H, W)，彩色图为(H, W, 3) RGB
+    """
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise OSError("Failed to decode JPEG data")
+    if img.ndim == 3:
+        # OpenCV输出BGR，原地转换为RGB
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+    return img
+
+
+def decode_image_bytes(data: bytes | np.ndarray) -> np.ndarray:
+    """
+    解码内存中的编码图像数据（如HDF5中按帧存储的图像字节）
+    根据文件头魔数分派：JPEG依次尝试libjpeg-turbo、imagecodecs、OpenCV，
+    PNG/WebP使用imagecodecs（libpng/libwebp），其余格式或未安装时回退到PIL
+    """
+    # 编码数据按原样交给解码器（各解码器都接受任意缓冲区），避免额外的tobytes拷贝
+    if isinstance(data, np.ndarray) and not data.flags.c_contiguous:
+        data = np.ascontiguousarray(data)
+    header = bytes(data[:12])
+    if header.startswith(JPEG_MAGIC):
+        if HAS_TURBOJPEG:
+            return decode_jpeg_bytes(data)
+        if HAS_IMAGECODECS:
+            return imagecodecs.jpeg8_decode(data)
+        if HAS_CV2:
+            return decode_jpeg_cv2(data)
+    elif HAS_IMAGECODECS:
+        if header.startswith(PNG_MAGIC):
+            return imagecodecs.png_decode(data)
+        if header[:4] == RIFF_MAGIC and header[8:12] == WEBP_MAGIC:
+            return imagecodecs.webp_decode(data)
+
+    with Image.open(io.BytesIO(data)) as img:
+        return pil_to_ndarray(img)
+
+
+def decode_image_file(path: Path) -> np.ndarray:
+    """
+    读取并解码图像文件为numpy数组
+    JPEG优先使用libjpeg-turbo（SIMD）解码，其次OpenCV，其余格式或未安装时回退到PIL
+    """
+    if (HAS_TURBOJPEG or HAS_CV2) and path.suffix.lower() in JPEG_SUFFIXES:
+        with open(path, "rb") as image_file:
+            data = image_file.read()
+        return decode_jpeg_bytes(data) if HAS_TURBOJPEG else decode_jpeg_cv2(data)
+
+    with Image.open(path) as img:
+        return pil_to_ndarray(img)
+
+
+def readahead_files(paths: Iterable[Path]) -> None:
+    """
+    通过posix_fadvise(WILLNEED)一次性通知内核预读一批文件
+    内核异步发起读取，可以填满设备队列深度，后续逐帧解码时直接命中页缓存；
+    平台不支持或文件无法打开时静默跳过
+    """
+    if not HAS_FADVISE:
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -0,0 +1,98 @@
+"""
+测试 FramePrefetcher 的预读窗口与过期任务取消。
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Executor, Future
+
+import numpy as np
+
+from robocoin_dataset.format_converter.utils.frame_prefetcher import FramePrefetcher
+
+
+class _ManualExecutor(Executor):
+    """记录提交的任务，不自动执行，便于检查预读与取消"""
+
+    def __init__(self) -> None:
+        self.submitted: dict[Hashable, Future] = {}
+
+    def submit(self, fn: Callable, key: Hashable) -> Future:
+        future = Future()
+        self.submitted[key] = future
+        return future
+
+
+def _decode(key: int) -> np.ndarray:
+    return np.full((2, 2), key)
+
+
+def test_get_submits_only_window_upcoming_frames() -> None:
+    executor = _ManualExecutor()
+    prefetcher = FramePrefetcher(executor, _decode, window=3)
+
+    result = prefetcher.get(0, range(1, 10))
+
+    np.testing.assert_array_equal(result, _decode(0))
+    assert sorted(executor.submitted) == [1, 2, 3]
+
+
+def test_get_zero_window_decodes_synchronously() -> None:
+    executor = _ManualExecutor()
+    prefetcher = FramePrefetcher(executor, _decode, window=0)
+
+    np.testing.assert_array_equal(prefetcher.get(5, range(6, 10)), _decode(5))
+    assert executor.submitted == {}
+
+
+def test_get_cancels_frames_outside_window() -> None:
+    executor = _ManualExecutor()
+    prefetcher = FramePrefetcher(executor, _decode, window=2)
+    prefetcher.get(0, range(1, 10))
+    stale = executor.submitted[1]
+    still_needed = executor.submitted[2]
+
+    # 跳到帧2：帧1已不在窗口内，帧2的预读结果被直接使用
+    still_needed.set_result(_decode(2))
+    result = prefetcher.get(2, range(3, 10))
+
+    assert stale.cancelled()
+    assert not still_needed.cancelled()
+    np.testing.assert_array_equal(result, _decode(2))
+    assert sorted(executor.submitted) == [1, 2, 3, 4]
+
+
+def test_get_keeps_current_frame_for_repeated_access() -> None:
+    calls = []
+
+    def decode(key: int) -> np.ndarray:
+        calls.append(key)
+        return _decode(key)
+
+    prefetcher = FramePrefetcher(_ManualExecutor(), decode, window=1)
+
+    first = prefetcher.get(7)
+    second = prefetcher.get(7)
+
+    assert calls == [7]
+    assert second is first
+
+
+def test_get_waits_for_prefetched_result() -> None:
+    executor = _ManualExecutor()
+    prefetcher = FramePrefetcher(executor, _decode, window=1)
+    prefetcher.get(0, [1])
+    future = executor.submitted[1]
+    threading.Timer(0.05, future.set_result, args=(_decode(1),)).start()
+
+    np.testing.assert_array_equal(prefetcher.get(1, [2]), _decode(1))
+
+
+def test_clear_cancels_pending_frames() -> None:
+    executor = _ManualExecutor()
+    prefetcher = FramePrefetcher(executor, _decode, window=2)
+    prefetcher.get(0, [1, 2])
+
+    prefetcher.clear()
+
+    assert all(future.cancelled() for future in executor.submitted.values())
@@ -0,0 +1,26 @@
+"""
+测试 HDF5 文件查找的排序。
+"""
+
+from pathlib import Path
+
+from natsort import natsorted
+
+from robocoin_dataset.format_converter.utils.h5_files import find_h5_files
+
+
+def test_find_h5_files_keeps_per_suffix_order(tmp_path: Path) -> None:
+    for name in ["ep10.h5", "ep2.hdf5", "ep1.h5", "ep3.hdf5", "sub/ep11.h5", "ep2.h5", "x.txt"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+
+    expected = natsorted(tmp_path.rglob("*.h5")) + natsorted(tmp_path.rglob("*.hdf5"))
+    assert find_h5_files(tmp_path) == expected
+    assert [path.name for path in find_h5_files(tmp_path)] == [
+        "ep1.h5",
+        "ep2.h5",
+        "ep10.h5",
+        "ep11.h5",
+        "ep2.hdf5",
+        "ep3.hdf5",
+    ]
@@ -0,0 +1,214 @@
+"""
+测试图像解码函数的格式分派与输出。
+"""
+
+import io
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from robocoin_dataset.format_converter.utils import image_decoder
+
+
+def _encode(array: np.ndarray, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _pil_decode(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img)
+
+
+def _gradient(shape: tuple[int, ...]) -> np.ndarray:
+    return (np.arange(np.prod(shape)) * 7 % 256).astype(np.uint8).reshape(shape)
+
+
+@pytest.fixture
+def no_accelerators(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(image_decoder, "HAS_TURBOJPEG", False)
+    monkeypatch.setattr(image_decoder, "HAS_IMAGECODECS", False)
+    monkeypatch.setattr(image_decoder, "HAS_CV2", False)
+
+
+@pytest.fixture
+def calls(monkeypatch: pytest.MonkeyPatch, no_accelerators: None) -> list[str]:
+    """把各加速解码器替换为只记录调用的函数"""
+    recorded: list[str] = []
+
+    def recorder(name: str) -> Callable[[bytes], str]:
+        def decode(data: bytes) -> str:
+            recorded.append(name)
+            return name
+
+        return decode
+
+    monkeypatch.setattr(image_decoder, "decode_jpeg_bytes", recorder("turbojpeg"))
+    monkeypatch.setattr(image_decoder, "decode_jpeg_cv2", recorder("cv2"))
+    monkeypatch.setattr(
+        image_decoder,
+        "imagecodecs",
+        SimpleNamespace(
+            jpeg8_decode=recorder("imagecodecs.jpeg"),
+            png_decode=recorder("imagecodecs.png"),
+            webp_decode=recorder("imagecodecs.webp"),
+        ),
+        raising=False,
+    )
+    return recorded
+
+
+JPEG_DATA = _encode(_gradient((8, 10, 3)), "JPEG")
+PNG_DATA = _encode(_gradient((8, 10, 3)), "PNG")
+WEBP_HEADER = b"RIFF\x00\x00\x00\x00WEBPVP8 "
+
+
+@pytest.mark.parametrize(
+    ("flags", "expected"),
+    [
+        (("HAS_TURBOJPEG", "HAS_IMAGECODECS", "HAS_CV2"), "turbojpeg"),
+        (("HAS_IMAGECODECS", "HAS_CV2"), "imagecodecs.jpeg"),
+        (("HAS_CV2",), "cv2"),
+    ],
+)
+def test_decode_image_bytes_jpeg_prefers_fastest_decoder(
+    monkeypatch: pytest.MonkeyPatch, calls: list[str], flags: tuple[str, ...], expected: str
+) -> None:
+    for flag in flags:
+        monkeypatch.setattr(image_decoder, flag, True)
+
+    assert image_decoder.decode_image_bytes(JPEG_DATA) == expected
+    assert calls == [expected]
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [(PNG_DATA, "imagecodecs.png"), (WEBP_HEADER, "imagecodecs.webp")],
+)
+def test_decode_image_bytes_png_webp_use_imagecodecs(
+    monkeypatch: pytest.MonkeyPatch, calls: list[str], data: bytes, expected: str
+) -> None:
+    monkeypatch.setattr(image_decoder, "HAS_IMAGECODECS", True)
+
+    assert image_decoder.decode_image_bytes(data) == expected
+    assert calls == [expected]
+
+
+def test_decode_image_bytes_png_skips_jpeg_decoders(
+    monkeypatch: pytest.MonkeyPatch, calls: list[str]
+) -> None:
+    monkeypatch.setattr(image_decoder, "HAS_TURBOJPEG", True)
+    monkeypatch.setattr(image_decoder, "HAS_CV2", True)
+
+    np.testing.assert_array_equal(
+        image_decoder.decode_image_bytes(PNG_DATA), _pil_decode(PNG_DATA)
+    )
+    assert calls == []
+
+
+@pytest.mark.usefixtures("no_accelerators")
+@pytest.mark.parametrize("data", [JPEG_DATA, PNG_DATA])
+def test_decode_image_bytes_falls_back_to_pil(data: bytes) -> None:
+    np.testing.assert_array_equal(image_decoder.decode_image_bytes(data), _pil_decode(data))
+
+
+@pytest.mark.usefixtures("no_accelerators")
+def test_decode_image_bytes_accepts_non_contiguous_arrays() -> None:
+    # HDF5中逐帧读出的字节可能是非连续的视图
+    strided = np.repeat(np.frombuffer(PNG_DATA, dtype=np.uint8), 2)[::2]
+    assert not strided.flags.c_contiguous
+
+    np.testing.assert_array_equal(
+        image_decoder.decode_image_bytes(strided), _pil_decode(PNG_DATA)
+    )
+
+
+@pytest.fixture
+def cv2_only(monkeypatch: pytest.MonkeyPatch, no_accelerators: None) -> None:
+    """只启用OpenCV解码路径，未安装OpenCV时跳过"""
+    pytest.importorskip("cv2")
+    monkeypatch.setattr(image_decoder, "HAS_CV2", True)
+
+
+def _color_image() -> np.ndarray:
+    # 左半纯红、右半纯蓝：通道顺序错误（BGR）时红蓝互换
+    image = np.zeros((16, 16, 3), dtype=np.uint8)
+    image[:, :8, 0] = 255
+    image[:, 8:, 2] = 255
+    return image
+
+
+@pytest.mark.usefixtures("cv2_only")
+def test_decode_jpeg_cv2_matches_pil_rgb() -> None:
+    data = _encode(_color_image(), "JPEG")
+
+    result = image_decoder.decode_jpeg_cv2(data)
+
+    expected = _pil_decode(data)
+    assert result.shape == expected.shape == (16, 16, 3)
+    assert result.dtype == np.uint8
+    np.testing.assert_allclose(result, expected, atol=2)
+    assert result[8, 2, 0] > 200 and result[8, 2, 2] < 50
+    assert result[8, 13, 2] > 200 and result[8, 13, 0] < 50
+
+
+@pytest.mark.usefixtures("cv2_only")
+def test_decode_jpeg_cv2_grayscale_is_two_dimensional() -> None:
+    data = _encode(_gradient((8, 10)), "JPEG")
+
+    result = image_decoder.decode_jpeg_cv2(data)
+
+    assert result.shape == (8, 10)
+    np.testing.assert_allclose(result, _pil_decode(data), atol=2)
+
+
+@pytest.mark.usefixtures("cv2_only")
+def test_decode_jpeg_cv2_raises_on_corrupt_data() -> None:
+    with pytest.raises(OSError):
+        image_decoder.decode_jpeg_cv2(image_decoder.JPEG_MAGIC + b"\x00" * 64)
+
+
+@pytest.mark.usefixtures("cv2_only")
+@pytest.mark.parametrize("shape", [(16, 16, 3), (8, 10)])
+def test_decode_image_file_cv2_matches_pil(tmp_path: Path, shape: tuple[int, ...]) -> None:
+    path = tmp_path / "frame.jpg"
+    path.write_bytes(_encode(_gradient(shape), "JPEG"))
+
+    result = image_decoder.decode_image_file(path)
+
+    expected = _pil_decode(path.read_bytes())
+    assert result.shape == expected.shape == shape
+    np.testing.assert_allclose(result, expected, atol=2)
+
+
+@pytest.mark.parametrize("accelerated", [False, True])
+def test_decode_image_file_raises_oserror_on_corrupt_jpeg(
+    monkeypatch: pytest.MonkeyPatch, no_accelerators: None, tmp_path: Path, accelerated: bool
+) -> None:
+    if accelerated:
+        pytest.importorskip("cv2")
+        monkeypatch.setattr(image_decoder, "HAS_CV2", True)
+    path = tmp_path / "frame.jpg"
+    path.write_bytes(image_decoder.JPEG_MAGIC + b"\x00" * 64)
+
+    with pytest.raises(OSError):
+        image_decoder.decode_image_file(path)
+
+
+def test_decode_image_file_dispatches_by_suffix(
+    monkeypatch: pytest.MonkeyPatch, calls: list[str], tmp_path: Path
+) -> None:
+    monkeypatch.setattr(image_decoder, "HAS_CV2", True)
+    jpeg_path = tmp_path / "frame.JPEG"
+    jpeg_path.write_bytes(JPEG_DATA)
+    png_path = tmp_path / "frame.png"
+    png_path.write_bytes(PNG_DATA)
+
+    assert image_decoder.decode_image_file(jpeg_path) == "cv2"
+    np.testing.assert_array_equal(image_decoder.decode_image_file(png_path), _pil_decode(PNG_DATA))
+    assert calls == ["cv2"]
@@ -0,0 +1,189 @@
+"""
+测试 MMK2 转换器的纯 Python BSON 解析函数。
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+pytest.importorskip("lerobot")
+
+from robocoin_dataset.format_converter.tolerobot import (  # noqa: E402
+    lerobot_format_converter_mmk2 as mmk2,
+)
+
+
+def _encode_value(value: object) -> tuple[int, bytes]:
+    if isinstance(value, bool):
+        return 0x08, b"\x01" if value else b"\x00"
+    if isinstance(value, float):
+        return 0x01, struct.pack("<d", value)
+    if isinstance(value, int):
+        return 0x10, struct.pack("<i", value)
+    if isinstance(value, str):
+        encoded = value.encode() + b"\x00"
+        return 0x02, struct.pack("<I", len(encoded)) + encoded
+    if isinstance(value, dict):
+        return 0x03, _encode_document(value)
+    if isinstance(value, list):
+        return 0x04, _encode_array(value)
+    raise TypeError(f"Unsupported value: {value!r}")
+
+
+def _encode_document(doc: dict) -> bytes:
+    body = b""
+    for name, value in doc.items():
+        field_type, encoded = _encode_value(value)
+        body += bytes([field_type]) + name.encode() + b"\x00" + encoded
+    return struct.pack("<I", len(body) + 5) + body + b"\x00"
+
+
+def _encode_array(values: list) -> bytes:
+    return _encode_document({str(i): value for i, value in enumerate(values)})
+
+
+@pytest.fixture
+def pure_python_bson(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 强制走纯Python解析路径，不依赖是否安装了PyMongo
+    monkeypatch.setattr(mmk2, "HAS_BSON", False)
+
+
+def test_parse_bson_index_records_top_level_fields() -> None:
+    data = _encode_document({"meta": {"name": "x"}, "data": {"pos": [1.0, 2.0]}, "n": 3})
+
+    index = mmk2.parse_bson_index(data)
+
+    assert list(index) == ["meta", "data", "n"]
+    assert index["meta"][0] == 0x03
+    assert index["data"][0] == 0x03
+    field_type, pos, size = index["n"]
+    assert (field_type, size) == (0x10, 4)
+    assert data[pos:pos + size] == struct.pack("<i", 3)
+
+
+def test_parse_bson_index_at_offset() -> None:
+    inner = {"a": 1, "b": "text"}
+    data = _encode_document({"outer": inner})
+    _, pos, _ = mmk2.parse_bson_index(data)["outer"]
+
+    assert list(mmk2.parse_bson_index(data, pos)) == ["a", "b"]
+
+
+@pytest.mark.usefixtures("pure_python_bson")
+def test_decode_bson_field_decodes_documents_and_arrays() -> None:
+    data = _encode_document(
+        {
+            "meta": {"name": "x", "ok": True},
+            "mixed": [1, "a", {"k": 2.5}],
+            "doubles": [0.5, 1.5, 2.5],
+        }
+    )
+    index = mmk2.parse_bson_index(data)
+
+    assert mmk2.decode_bson_field(data, index["meta"]) == {"name": "x", "ok": True}
+    assert mmk2.decode_bson_field(data, index["mixed"]) == [1, "a", {"k": 2.5}]
+    doubles = mmk2.decode_bson_field(data, index["doubles"])
+    assert isinstance(doubles, np.ndarray)
+    np.testing.assert_array_equal(doubles, [0.5, 1.5, 2.5])
+
+
+def test_decode_bson_field_rejects_scalar_fields() -> None:
+    data = _encode_document({"n": 3})
+
+    with pytest.raises(ValueError, match="Unsupported BSON field type"):
+        mmk2.decode_bson_field(data, mmk2.parse_bson_index(data)["n"])
+
+
+@pytest.mark.usefixtures("pure_python_bson")
+def test_decode_bson_field_rejects_truncated_documents() -> None:
+    data = _encode_document({"meta": {"name": "x"}})
+    field_type, pos, size = mmk2.parse_bson_index(data)["meta"]
+
+    with pytest.raises(ValueError, match="Truncated"):
+        mmk2.decode_bson_field(data[:pos + size - 1], (field_type, pos, size))
+
+
+# 索引键位数变化处（"9"->"10"、"99"->"100"、"999"->"1000"）元素间隔改变，需分段读取
+_ARRAY_LENGTHS = [1, 9, 10, 11, 99, 100, 101, 999, 1000, 1001, 1234]
+
+
+@pytest.mark.parametrize("length", _ARRAY_LENGTHS)
+def test_parse_bson_double_array_across_key_widths(length: int) -> None:
+    values = [i * 0.5 - 3.0 for i in range(length)]
+    data = _encode_array(values)
+
+    result = mmk2._parse_bson_double_array(data, 0, len(data))
+
+    assert result.dtype == np.float64
+    assert result.flags.c_contiguous
+    np.testing.assert_array_equal(result, values)
+
+
+@pytest.mark.parametrize("length", _ARRAY_LENGTHS)
+def test_parse_bson_double_array_falls_back_for_mixed_arrays(length: int) -> None:
+    # 最后一个元素（可能恰好位于新的键宽分段内）不是double
+    values: list = [float(i) for i in range(length - 1)] + [length - 1]
+    data = _encode_array(values)
+
+    assert mmk2._parse_bson_double_array(data, 0, len(data)) is None
+    result, end = mmk2.parse_bson_document(data, 0, as_array=True)
+    assert isinstance(result, list)
+    assert result == values
+    assert type(result[-1]) is int
+    assert end == len(data)
+
+
+@pytest.mark.parametrize("position", [0, 9, 10, 99, 100, 999, 1000])
+def test_parse_bson_double_array_rejects_non_double_at_segment_edges(position: int) -> None:
+    values: list = [float(i) for i in range(1001)]
+    values[position] = "x"
+    data = _encode_array(values)
+
+    assert mmk2._parse_bson_double_array(data, 0, len(data)) is None
+    assert mmk2.parse_bson_document(data, 0, as_array=True)[0] == values
+
+
+def test_parse_bson_document_empty_array() -> None:
+    data = _encode_array([])
+
+    assert mmk2._parse_bson_double_array(data, 0, len(data)) is None
+    assert mmk2.parse_bson_document(data, 0, as_array=True) == ([], len(data))
+
+
+def test_parse_bson_document_nested_arrays() -> None:
+    positions = [float(i) for i in range(12)]
+    data = _encode_document({"pos": positions, "tags": [1, "a"], "name": "arm"})
+
+    doc, end = mmk2.parse_bson_document(data)
+
+    assert end == len(data)
+    assert isinstance(doc["pos"], np.ndarray)
+    np.testing.assert_array_equal(doc["pos"], positions)
+    assert doc["tags"] == [1, "a"]
+    assert doc["name"] == "arm"
+
+
+@pytest.mark.parametrize("length", [0, *_ARRAY_LENGTHS])
+def test_count_bson_entries_matches_array_length(length: int) -> None:
+    frames = [{"t": i, "data": {"pos": [float(i), 2.0]}, "name": f"f{i}"} for i in range(length)]
+
+    assert mmk2.count_bson_entries(_encode_array(frames)) == length
+
+
+def test_count_bson_entries_at_offset() -> None:
+    data = _encode_document({"meta": {"name": "x"}, "frames": [1.0, "a", True, {"k": 1}, [2, 3]]})
+    _, pos, _ = mmk2.parse_bson_index(data)["frames"]
+
+    assert mmk2.count_bson_entries(data, pos) == 5
+
+
+def test_count_bson_entries_stops_on_truncated_or_unknown_data() -> None:
+    data = _encode_array([1.0, 2.0, 3.0])
+
+    assert mmk2.count_bson_entries(data[:-1]) == 0
+    assert mmk2.count_bson_entries(data[:3]) == 0
+    # 0x06（undefined）不在已知类型中，无法确定长度，计数停在该元素之前
+    unknown = bytearray(data)
+    unknown[4 + 2 * 11] = 0x06
+    assert mmk2.count_bson_entries(bytes(unknown)) == 2
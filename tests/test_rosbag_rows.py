@@ -0,0 +1,59 @@
+"""
+测试 rosbag 数值 topic 的逐行堆叠。
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# 转换器模块依赖rosbags、lerobot及time_alignment模块，任一无法导入时跳过
+rosbag = pytest.importorskip(
+    "robocoin_dataset.format_converter.tolerobot.lerobot_format_converter_rosbag"
+)
+
+
+def _position(msg: SimpleNamespace) -> list[float]:
+    return msg.position
+
+
+def _joint_states(*positions: list[float]) -> list[SimpleNamespace]:
+    return [SimpleNamespace(position=position) for position in positions]
+
+
+def test_stack_rows_stacks_equal_length_rows() -> None:
+    messages = _joint_states([0.0, 1.0, 2.0], [3.0, 4.0, 5.0])
+
+    rows = rosbag.LerobotFormatConverterRosbag._stack_rows(messages, _position)
+
+    assert isinstance(rows, np.ndarray)
+    assert rows.dtype == np.float64
+    np.testing.assert_array_equal(rows, [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]])
+
+
+@pytest.mark.parametrize(
+    "positions",
+    [
+        # 后续帧维度多于或少于第一帧
+        ([0.0, 1.0], [2.0, 3.0, 4.0], [5.0, 6.0]),
+        ([0.0, 1.0, 2.0], [3.0, 4.0]),
+        # 长度为1的行不能被广播到整行
+        ([0.0, 1.0, 2.0], [7.0], [3.0, 4.0, 5.0]),
+    ],
+)
+def test_stack_rows_falls_back_to_list_for_ragged_rows(positions: tuple[list[float], ...]) -> None:
+    rows = rosbag.LerobotFormatConverterRosbag._stack_rows(_joint_states(*positions), _position)
+
+    assert isinstance(rows, list)
+    assert len(rows) == len(positions)
+    for row, position in zip(rows, positions):
+        np.testing.assert_array_equal(row, position)
+
+
+def test_stack_rows_single_column_topic() -> None:
+    rows = rosbag.LerobotFormatConverterRosbag._stack_rows(
+        _joint_states([1.0], [2.0], [3.0]), _position
+    )
+
+    assert isinstance(rows, np.ndarray)
+    np.testing.assert_array_equal(rows, [[1.0], [2.0], [3.0]])